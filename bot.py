@@ -13,16 +13,28 @@
 
 import os
 import json
+import re
+import hmac
+import hashlib
 import asyncio
-from typing import List, Optional, Tuple, Dict, Callable, TypeVar, Union
+import contextlib
+import heapq
+import time
+import bisect
+import contextvars
+import urllib.parse
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Dict, Callable, Awaitable, TypeVar, Union, NamedTuple
 from datetime import datetime, date, timezone, timedelta
 
 import aiosqlite
 import discord
+import aiohttp
+from aiohttp import web
+from yarl import URL
 from discord import app_commands
 from discord.ext import tasks
-from github import Github, GithubException
-from github.Issue import Issue as GH_Issue
+from github import GithubException
 
 # ========= 環境変数 =========
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
@@ -30,6 +42,10 @@ GUILD_ID = int(os.getenv("DISCORD_GUILD_ID", "0")) or None  # None ならグロ
 GH_TOKEN = os.getenv("GITHUB_TOKEN")
 GH_OWNER = os.getenv("GITHUB_OWNER")
 GH_REPO = os.getenv("GITHUB_REPO")
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")  # 設定時のみ Webhook 受信を有効化
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/github/webhook")
 
 # ========= 定数 =========
 DB_PATH = "bot.db"
@@ -37,8 +53,37 @@ STATUS_LABELS = {"status:todo", "status:in_progress", "status:done"}
 DEFAULT_INTERVAL_MIN = int(os.getenv("LIST_UPDATE_INTERVAL_MIN", "5"))  # 既定 5分
 MAX_PER_SECTION = 50
 DISCORD_MSG_LIMIT = 2000
+COLLAB_ISSUE_SCAN = 200  # 担当者候補を拾うために見る Issue 件数（新しい順）
+COLLAB_REFRESH_SEC = int(os.getenv("COLLAB_REFRESH_SEC", str(24 * 3600)))  # 担当者候補の再取得間隔
+LABEL_CACHE_TTL_SEC = int(os.getenv("LABEL_CACHE_TTL_SEC", "300"))  # ラベル一覧の再取得間隔（超過後は裏で取り直す）
+MAX_BUNDLE_MESSAGES = int(os.getenv("MAX_BUNDLE_MESSAGES", "10"))  # 1バンドルが使うメッセージ数の上限
 TASK_LIST_PAGE_SIZE = 6
 TASK_LIST_EMBED_COLOR = 0x2B90D9
+GH_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "10"))  # GitHub HTTP コネクションプール上限
+GH_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")  # GHES は https://<host>/api/v3
+GH_HTTP_TIMEOUT_SEC = 30  # GitHub への1リクエストの上限（秒）
+GH_INTERACTIVE_WORKERS = int(os.getenv("GITHUB_INTERACTIVE_WORKERS", "4"))  # コマンド由来の GitHub 同時リクエスト数
+GH_BACKGROUND_WORKERS = int(os.getenv("GITHUB_BACKGROUND_WORKERS", "2"))    # 定期更新など裏方の GitHub 同時リクエスト数
+GH_PAGE_CONCURRENCY = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))  # 一覧のページを並行に取るときのホストごとの上限
+BACKGROUND_YIELD_MAX_SEC = 2.0  # 裏方のページ取得がコマンドの完了を待つ上限（秒）
+MIRROR_INITIAL_LIMIT = 200  # 初回同期で取り込む件数（open/closed それぞれ）
+MIRROR_SYNC_BATCH = 1000    # 差分同期1回あたりの上限（残りは次回に続きから）
+MIRROR_CLOSED_LIMIT = 200   # 読み出し時の closed 件数上限
+MIRROR_SYNC_MIN_SEC = int(os.getenv("MIRROR_SYNC_MIN_SEC", "30"))  # この秒数以内の再同期は省略
+MIRROR_RECONCILE_MIN = int(os.getenv("MIRROR_RECONCILE_MIN", "60"))  # 削除・移管された Issue をミラーから外す突き合わせ間隔(分)
+SNAPSHOT_TTL_SEC = int(os.getenv("SNAPSHOT_TTL_SEC", "60"))  # コマンド経由のスナップショット再利用時間
+GH_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "rest").lower()  # rest / graphql（ミラー同期の取得方式）
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "4"))  # バンドル更新の同時実行数
+REFRESH_TIMEOUT_SEC = int(os.getenv("REFRESH_TIMEOUT_SEC", "60"))  # 1チャンネルの更新に許す時間
+FOOTER_REFRESH_MIN = int(os.getenv("FOOTER_REFRESH_MIN", "30"))  # 内容不変でも「最終更新」を書き換える間隔(分)
+WEBHOOK_RECONCILE_MIN = int(os.getenv("WEBHOOK_RECONCILE_MIN", "30"))  # Webhook 有効時の定期突き合わせ間隔(分)
+BULK_MAX_ISSUES = int(os.getenv("BULK_MAX_ISSUES", "50"))  # 一括操作で一度に指定できる Issue 数
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "4"))  # 一括操作の同時実行数
+GH_RATE_RESERVE = int(os.getenv("GITHUB_RATE_RESERVE", "300"))  # 対話コマンド用に残すレート（これ以下ではバックグラウンド同期を止める）
+BULK_RATE_RESERVE = int(os.getenv("BULK_RATE_RESERVE", "200"))  # 残りレートがこれを下回ったら一括操作を打ち切る
+MUTATION_CACHE_MAX_AGE_SEC = int(os.getenv("MUTATION_CACHE_MAX_AGE_SEC", "300"))  # 変更操作でミラーの状態を信用する同期からの経過秒数
+DIRTY_REFRESH_DELAY_SEC = 2  # 変更操作の後、バンドル再描画を前倒しするまでの待ち（連続操作をまとめる）
+HTTP_CACHE_MAX_AGE_SEC = 7 * 24 * 3600  # 参照されなくなった条件付きリクエストのキャッシュを捨てるまでの時間
 
 # ========= Issueテンプレ =========
 ISSUE_TEMPLATES: Dict[str, Dict] = {
@@ -66,14 +111,314 @@ JST = timezone(timedelta(hours=9))
 def now_jst_str() -> str:
     return datetime.now(JST).strftime("%Y-%m-%d %H:%M:%S JST")
     
-def gh_client() -> Github:
+# --- asyncio の同期プリミティブはループ起動後に生成（Python 3.8/3.9 は生成時のループに束縛されるため）
+_ASYNC_LOCKS: Dict[str, asyncio.Lock] = {}
+
+def async_lock(name: str) -> asyncio.Lock:
+    lock = _ASYNC_LOCKS.get(name)
+    if lock is None:
+        lock = _ASYNC_LOCKS[name] = asyncio.Lock()
+    return lock
+
+# --- single-flight: 同じキーの処理が実行中なら、新たに始めずその結果を共有する
+_SINGLE_FLIGHT: Dict[str, asyncio.Task] = {}
+SINGLE_FLIGHT_STATS: Dict[str, int] = {"leaders": 0, "shared": 0}
+
+async def single_flight(key: str, factory: Callable[[], Awaitable]):
+    task = _SINGLE_FLIGHT.get(key)
+    if task is None:
+        SINGLE_FLIGHT_STATS["leaders"] += 1
+        task = _SINGLE_FLIGHT[key] = asyncio.ensure_future(factory())
+
+        def _done(t: asyncio.Task, key=key):
+            if _SINGLE_FLIGHT.get(key) is t:
+                del _SINGLE_FLIGHT[key]
+            if not t.cancelled():
+                t.exception()  # 待ち手が全員キャンセルされても警告を出さない
+        task.add_done_callback(_done)
+    else:
+        SINGLE_FLIGHT_STATS["shared"] += 1
+    # 呼び出し側がキャンセル/タイムアウトしても、共有中の処理は止めない
+    return await asyncio.shield(task)
+
+def single_flight_pending(key: str) -> bool:
+    return key in _SINGLE_FLIGHT
+
+# --- キー単位の TTL + stale-while-revalidate キャッシュ
+T = TypeVar('T')
+TTL_CACHES: List["AsyncTTLCache"] = []
+
+class AsyncTTLCache:
+    """TTL 内はそのまま返し、TTL 超過〜stale_sec までは古い値を返しつつ裏で取り直す。
+    同じキーの取得が重なった場合は 1 回の loader 呼び出しにまとめる。"""
+
+    def __init__(self, name: str, ttl_sec: float, stale_sec: float):
+        self.name = name
+        self.ttl_sec = ttl_sec
+        self.stale_sec = stale_sec
+        self._data: Dict[str, Tuple[float, object]] = {}  # key -> (取得時刻 monotonic, 値)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}  # 裏での取り直し（参照を持たないと GC で消えうる）
+        self.stats: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        TTL_CACHES.append(self)
+
+    def has(self, key: str) -> bool:
+        return key in self._data
+
+    def seed(self, key: str, value, age_sec: float = 0.0):
+        """外部（DB 等）から得た値を、経過時間付きで入れておく。"""
+        self._data[key] = (time.monotonic() - max(0.0, age_sec), value)
+
+    def expire(self, key: str):
+        """値は残したまま期限切れ扱いにする（次回参照で裏更新）。"""
+        if key in self._data:
+            self._data[key] = (time.monotonic() - self.ttl_sec, self._data[key][1])
+
+    def invalidate(self, key: Optional[str] = None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        ent = self._data.get(key)
+        if ent is not None:
+            age = time.monotonic() - ent[0]
+            if age < self.ttl_sec:
+                self.stats["hits"] += 1
+                return ent[1]
+            if age < self.ttl_sec + self.stale_sec:
+                self.stats["stale_hits"] += 1
+                if key not in self._pending and key not in self._refreshing:
+                    task = self._refreshing[key] = asyncio.create_task(self._load_quiet(key, loader))
+                    task.add_done_callback(lambda t, key=key: self._refreshing.pop(key, None))
+                return ent[1]
+        self.stats["misses"] += 1
+        try:
+            return await self._load(key, loader)
+        except Exception:
+            if ent is not None:
+                return ent[1]  # 取り直しに失敗したら期限切れでも手元の値で凌ぐ
+            raise
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        fut = self._pending.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[key] = fut
+        try:
+            self.stats["refreshes"] += 1
+            value = await loader()
+        except Exception as e:
+            self.stats["errors"] += 1
+            fut.set_exception(e)
+            fut.exception()  # 待ち手がいなくても "never retrieved" 警告を出さない
+            raise
+        else:
+            self._data[key] = (time.monotonic(), value)
+            fut.set_result(value)
+            return value
+        finally:
+            self._pending.pop(key, None)
+
+    async def _load_quiet(self, key: str, loader: Callable[[], Awaitable[T]]):
+        GH_LANE.set("background")  # 裏での取り直しはコマンドより後回し
+        if RATE_BUDGET.skip_background():
+            return  # 予算が戻るまでは古い値のまま（stale 窓を過ぎればコマンド側で取り直す）
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            print(f"{self.name} cache refresh error:", e)
+
+    def summary(self) -> str:
+        st = self.stats
+        return (
+            f"{self.name}: hits={st['hits']} stale={st['stale_hits']} misses={st['misses']} "
+            f"refreshes={st['refreshes']} errors={st['errors']} keys={len(self._data)}"
+        )
+
+# --- GitHub HTTP（aiohttp。プロセス共通のセッション/コネクションプールを使い回す）
+# 呼び出しごとにスレッドを塞がないよう、REST/GraphQL ともイベントループ上で直接送る。
+_GH_SESSION: Optional[aiohttp.ClientSession] = None
+GH_HTTP_STATS: Dict[str, int] = {"requests": 0, "inflight": 0, "inflight_max": 0}
+
+def gh_session() -> aiohttp.ClientSession:
+    global _GH_SESSION
     if not GH_TOKEN:
         raise RuntimeError("GITHUB_TOKEN 未設定")
-    return Github(GH_TOKEN, per_page=100)
+    if _GH_SESSION is None or _GH_SESSION.closed:
+        _GH_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=GH_POOL_SIZE, limit_per_host=GH_POOL_SIZE, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=GH_HTTP_TIMEOUT_SEC),
+            headers={
+                "Authorization": f"Bearer {GH_TOKEN}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+                "User-Agent": "Issue-Discord",
+            },
+        )
+    return _GH_SESSION
+
+async def close_gh_session():
+    global _GH_SESSION
+    if _GH_SESSION is not None:
+        await _GH_SESSION.close()
+        _GH_SESSION = None
+
+def _gh_url(url: str) -> URL:
+    # 手組みの相対パスは API のベースURLに繋げる。どちらもエンコード済みなので再エンコードさせない
+    if not url.startswith(("http://", "https://")):
+        url = GH_API_URL + (url if url.startswith("/") else f"/{url}")
+    return URL(url, encoded=True)
+
+async def gh_http(verb: str, url: str, *, headers: Optional[Dict[str, str]] = None, payload: Optional[Dict] = None) -> Tuple[int, Dict[str, str], str]:
+    """GitHub へ1リクエスト送る。(status, 小文字化したヘッダ, 本文) を返し、レート制限ヘッダを RATE_BUDGET に反映する。"""
+    st = GH_HTTP_STATS
+    async with gh_lane_slot():
+        st["requests"] += 1
+        st["inflight"] += 1
+        st["inflight_max"] = max(st["inflight_max"], st["inflight"])
+        try:
+            async with gh_session().request(verb, _gh_url(url), headers=headers, json=payload) as resp:
+                text = await resp.text()
+                resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+                status = resp.status
+        finally:
+            st["inflight"] -= 1
+    RATE_BUDGET.observe(resp_headers, status)
+    return status, resp_headers, text
+
+def gh_error(status: int, headers: Dict[str, str], text: str) -> GithubException:
+    try:
+        data = json.loads(text) if text else None
+    except ValueError:
+        data = {"message": text}
+    return GithubException(status, data, headers)
+
+# --- GitHub 呼び出しの優先レーン
+# レーンごとに同時リクエスト数の枠を分け、定期更新が溜まってもコマンドが後ろに並ばないようにする。
+# 既定は interactive。定期更新・裏での再取得など裏方の入口で background を設定する（作成したタスクにも引き継がれる）。
+GH_LANE: contextvars.ContextVar = contextvars.ContextVar("gh_lane", default="interactive")
+_GH_LANE_SLOTS: Dict[str, asyncio.Semaphore] = {}
+LANE_STATS: Dict[str, Dict[str, float]] = {
+    lane: {"calls": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0} for lane in ("interactive", "background")
+}
+_INTERACTIVE_INFLIGHT = 0
+_INTERACTIVE_IDLE: Optional[asyncio.Event] = None
+
+def _lane_slots(lane: str) -> asyncio.Semaphore:
+    sem = _GH_LANE_SLOTS.get(lane)
+    if sem is None:
+        n = GH_INTERACTIVE_WORKERS if lane == "interactive" else GH_BACKGROUND_WORKERS
+        sem = _GH_LANE_SLOTS[lane] = asyncio.Semaphore(max(1, n))
+    return sem
+
+def _interactive_idle() -> asyncio.Event:
+    global _INTERACTIVE_IDLE
+    if _INTERACTIVE_IDLE is None:
+        _INTERACTIVE_IDLE = asyncio.Event()
+        _INTERACTIVE_IDLE.set()
+    return _INTERACTIVE_IDLE
+
+@contextlib.asynccontextmanager
+async def gh_lane_slot():
+    """現在のレーンの枠を1つ取って GitHub リクエストを送る。枠待ちの時間をレーン別に記録する。"""
+    global _INTERACTIVE_INFLIGHT
+    lane = GH_LANE.get()
+    if lane == "interactive":
+        _INTERACTIVE_INFLIGHT += 1
+        _interactive_idle().clear()
+    try:
+        queued = time.perf_counter()
+        async with _lane_slots(lane):
+            wait_ms = (time.perf_counter() - queued) * 1000
+            st = LANE_STATS[lane]
+            st["calls"] += 1
+            st["wait_ms_total"] += wait_ms
+            st["wait_ms_max"] = max(st["wait_ms_max"], wait_ms)
+            yield
+    finally:
+        if lane == "interactive":
+            _INTERACTIVE_INFLIGHT -= 1
+            if _INTERACTIVE_INFLIGHT == 0:
+                _interactive_idle().set()
+
+async def background_yield():
+    """裏方のページ取得の合間に呼ぶ。コマンドの GitHub 呼び出しが実行中なら、それが捌けるまで（上限付きで）待つ。"""
+    if GH_LANE.get() != "background":
+        return
+    await asyncio.sleep(0)
+    if _INTERACTIVE_INFLIGHT:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_interactive_idle().wait(), BACKGROUND_YIELD_MAX_SEC)
+
+def lane_summary() -> str:
+    parts = []
+    for lane, st in LANE_STATS.items():
+        avg = st["wait_ms_total"] / st["calls"] if st["calls"] else 0.0
+        parts.append(f"{lane}: calls={int(st['calls'])} wait_avg={avg:.1f}ms wait_max={st['wait_ms_max']:.1f}ms")
+    h = GH_HTTP_STATS
+    return (
+        " / ".join(parts)
+        + f" | interactive_inflight={_INTERACTIVE_INFLIGHT} http_requests={h['requests']} http_inflight_max={h['inflight_max']}"
+    )
+
+# --- DB 接続（プロセス共通。書き込み用と読み取り専用の2本。WAL + synchronous=NORMAL）
+# 書き込みは db_write() のロックで1本の列に並べ、ブロック終了時にまとめて commit する。
+# 読み取りは db_read() で別の読み取り専用接続を使う。書き込み側はトランザクションを開いたまま await を挟むため、
+# 同じ接続で読むと DELETE と INSERT の間のような書きかけの状態が見えてしまう。WAL なら別接続からは commit 済みの状態だけが見える。
+_DB: Optional[aiosqlite.Connection] = None
+_DB_READ: Optional[aiosqlite.Connection] = None
+
+async def db_conn() -> aiosqlite.Connection:
+    global _DB
+    if _DB is None:
+        async with async_lock("db_open"):
+            if _DB is None:
+                db = await aiosqlite.connect(DB_PATH, cached_statements=256)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                _DB = db
+    return _DB
+
+async def db_read_conn() -> aiosqlite.Connection:
+    global _DB_READ
+    if _DB_READ is None:
+        await db_conn()  # ファイル作成と WAL 切り替えは書き込み側で済ませておく
+        async with async_lock("db_open"):
+            if _DB_READ is None:
+                uri = "file:" + urllib.parse.quote(os.path.abspath(DB_PATH)) + "?mode=ro"
+                _DB_READ = await aiosqlite.connect(uri, uri=True, cached_statements=256)
+    return _DB_READ
+
+@contextlib.asynccontextmanager
+async def db_read():
+    yield await db_read_conn()
+
+@contextlib.asynccontextmanager
+async def db_write():
+    db = await db_conn()
+    async with async_lock("db_write"):
+        try:
+            yield db
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+
+async def db_close():
+    global _DB, _DB_READ
+    if _DB_READ is not None:
+        await _DB_READ.close()
+        _DB_READ = None
+    if _DB is not None:
+        await _DB.close()
+        _DB = None
 
 # --- DB: 旧binding互換 + 新: bundle/bundle_group ---
 async def db_init():
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_write() as db:
         # DEFAULT <整数> を直接埋め込む
         await db.execute(f"""
         CREATE TABLE IF NOT EXISTS binding (
@@ -128,6 +473,17 @@ async def db_init():
           suppress INTEGER NOT NULL DEFAULT 1
         )""")
 
+        # バンドルを構成するメッセージ（seq=0 は bundle.message_id。長い一覧は seq=1.. に続く）
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS bundle_message (
+          channel_id INTEGER NOT NULL,
+          seq INTEGER NOT NULL,
+          message_id INTEGER NOT NULL,
+          content_hash TEXT,
+          edited_at INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (channel_id, seq)
+        )""")
+
         # 旧 binding -> bundle への移行
         cur = await db.execute(
             "SELECT channel_id, list_message_id, label_filters, COALESCE(interval_min, ?) FROM binding WHERE id=1",
@@ -165,19 +521,63 @@ async def db_init():
                 (ch, name, labs_json or "[]")
             )
 
-        await db.commit()
+        # Issue ミラー（GitHub の一覧をローカルに保持し差分同期）
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS issue_mirror (
+          repo TEXT NOT NULL,
+          number INTEGER NOT NULL,
+          title TEXT NOT NULL,
+          state TEXT NOT NULL,
+          labels TEXT NOT NULL DEFAULT '[]',
+          assignees TEXT NOT NULL DEFAULT '[]',
+          due TEXT,
+          updated_at TEXT NOT NULL,
+          html_url TEXT NOT NULL,
+          PRIMARY KEY (repo, number)
+        )""")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_issue_mirror_state ON issue_mirror (repo, state, updated_at)")
+
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+          key TEXT PRIMARY KEY,
+          value TEXT NOT NULL
+        )""")
+
+        # 担当者補完の候補（再起動時はここから即座に返す）
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS collaborator (
+          repo TEXT NOT NULL,
+          login TEXT NOT NULL,
+          refreshed_at INTEGER NOT NULL,
+          PRIMARY KEY (repo, login)
+        )""")
+
+        # 条件付きリクエスト用（URLごとの ETag / Last-Modified と直近の応答）
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+          url TEXT PRIMARY KEY,
+          etag TEXT,
+          last_modified TEXT,
+          link_next TEXT,
+          body TEXT NOT NULL,
+          fetched_at INTEGER NOT NULL,
+          link_last TEXT
+        )""")
+        cur = await db.execute("PRAGMA table_info(http_cache)")
+        if "link_last" not in {r[1] for r in await cur.fetchall()}:
+            await db.execute("ALTER TABLE http_cache ADD COLUMN link_last TEXT")
+
 
 async def preset_save(name: str, label_filters: List[str], interval_min: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_write() as db:
         await db.execute(
             "INSERT INTO preset (name, label_filters, interval_min) VALUES (?, ?, ?) "
             "ON CONFLICT(name) DO UPDATE SET label_filters=excluded.label_filters, interval_min=excluded.interval_min",
             (name, json.dumps(label_filters), int(interval_min))
         )
-        await db.commit()
 
 async def preset_load(name: str) -> Optional[Tuple[List[str], int]]:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_read() as db:
         cur = await db.execute("SELECT label_filters, interval_min FROM preset WHERE name=?", (name,))
         row = await cur.fetchone()
         if not row:
@@ -186,7 +586,7 @@ async def preset_load(name: str) -> Optional[Tuple[List[str], int]]:
         return (labels, int(row[1]))
 
 async def preset_list(prefix: str = "") -> List[str]:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_read() as db:
         if prefix:
             cur = await db.execute("SELECT name FROM preset WHERE name LIKE ? ORDER BY name LIMIT 25", (f"{prefix}%",))
         else:
@@ -194,7 +594,7 @@ async def preset_list(prefix: str = "") -> List[str]:
         return [r[0] for r in await cur.fetchall()]
 
 async def upsert_bundle(channel_id: int, message_id: int, interval_min: int, pin: bool, suppress: bool):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_write() as db:
         cur = await db.execute("SELECT 1 FROM bundle WHERE channel_id=?", (channel_id,))
         if await cur.fetchone():
             await db.execute("UPDATE bundle SET message_id=?, interval_min=?, pin=?, suppress=? WHERE channel_id=?",
@@ -202,51 +602,290 @@ async def upsert_bundle(channel_id: int, message_id: int, interval_min: int, pin
         else:
             await db.execute("INSERT INTO bundle (channel_id, message_id, interval_min, pin, suppress) VALUES (?, ?, ?, ?, ?)",
                              (channel_id, message_id, int(interval_min), 1 if pin else 0, 1 if suppress else 0))
-        await db.commit()
 
 async def get_bundle(channel_id: int) -> Optional[Tuple[int,int,int,bool,bool]]:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_read() as db:
         cur = await db.execute("SELECT channel_id, message_id, interval_min, pin, suppress FROM bundle WHERE channel_id=?", (channel_id,))
         row = await cur.fetchone()
         if not row:
             return None
         return (int(row[0]), int(row[1]), int(row[2]), bool(row[3]), bool(row[4]))
 
+async def list_bundle_messages(channel_id: int) -> Dict[int, Tuple[int, Optional[str], int]]:
+    """seq -> (message_id, content_hash, edited_at)"""
+    async with db_read() as db:
+        cur = await db.execute("SELECT seq, message_id, content_hash, edited_at FROM bundle_message WHERE channel_id=?", (channel_id,))
+        return {int(seq): (int(mid), h, int(at or 0)) for seq, mid, h, at in await cur.fetchall()}
+
+async def save_bundle_message(channel_id: int, seq: int, message_id: int, content_hash: str, edited_at: int):
+    async with db_write() as db:
+        await db.execute(
+            "INSERT INTO bundle_message (channel_id, seq, message_id, content_hash, edited_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(channel_id, seq) DO UPDATE SET message_id=excluded.message_id, content_hash=excluded.content_hash, edited_at=excluded.edited_at",
+            (channel_id, int(seq), int(message_id), content_hash, int(edited_at))
+        )
+
+async def delete_bundle_message(channel_id: int, seq: int):
+    async with db_write() as db:
+        await db.execute("DELETE FROM bundle_message WHERE channel_id=? AND seq=?", (channel_id, int(seq)))
+
 async def upsert_bundle_group(channel_id: int, group_name: str, label_filters: List[str]):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_write() as db:
         await db.execute(
             "INSERT INTO bundle_group (channel_id, group_name, label_filters) VALUES (?, ?, ?) "
             "ON CONFLICT(channel_id, group_name) DO UPDATE SET label_filters=excluded.label_filters",
             (channel_id, group_name, json.dumps(label_filters))
         )
-        await db.commit()
 
 async def delete_bundle_group(channel_id: int, group_name: str) -> bool:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_write() as db:
         cur = await db.execute("DELETE FROM bundle_group WHERE channel_id=? AND group_name=?", (channel_id, group_name))
-        await db.commit()
         return cur.rowcount > 0
 
 async def list_bundle_groups(channel_id: int) -> List[Tuple[str, List[str]]]:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_read() as db:
         cur = await db.execute("SELECT group_name, label_filters FROM bundle_group WHERE channel_id=? ORDER BY group_name", (channel_id,))
         out = []
         for name, labs in await cur.fetchall():
             out.append((name, json.loads(labs) if labs else []))
         return out
 
+async def list_all_bundle_groups() -> List[Tuple[int, List[str]]]:
+    async with db_read() as db:
+        cur = await db.execute("SELECT channel_id, label_filters FROM bundle_group")
+        return [(int(ch), json.loads(labs) if labs else []) for ch, labs in await cur.fetchall()]
+
+# ========= GitHub レート制限の予算 =========
+class RateBudget:
+    """
+    応答ヘッダ（X-RateLimit-*）から残量をリソース（core / graphql / search）ごとに追跡する。
+    - 残りが reserve 以下ならバックグラウンド処理（ミラー同期など）は reset まで止め、残りは対話コマンドに回す
+    - 残りの割合に応じてバンドルの更新間隔を引き延ばす
+    - 403/429 の Retry-After（二次レート制限）の間は全リソースで止める
+    now 引数は試験用（省略時は現在時刻）。
+    """
+
+    def __init__(self, reserve: int):
+        self.reserve = reserve
+        self._state: Dict[str, Tuple[int, int, int]] = {}  # resource -> (remaining, limit, reset epoch)
+        self._blocked_until = 0.0
+        self.stats: Dict[str, int] = {"updates": 0, "background_skips": 0, "limited_responses": 0}
+
+    def observe(self, headers: Optional[Dict[str, str]], status: Optional[int] = None, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        h = {str(k).lower(): v for k, v in (headers or {}).items()}
+        try:
+            if "x-ratelimit-remaining" in h:
+                resource = h.get("x-ratelimit-resource", "core")
+                self._state[resource] = (
+                    int(h["x-ratelimit-remaining"]),
+                    int(h.get("x-ratelimit-limit", 0)),
+                    int(h.get("x-ratelimit-reset", 0)),
+                )
+                self.stats["updates"] += 1
+            if status in (403, 429):
+                self.stats["limited_responses"] += 1
+                if h.get("retry-after"):
+                    self._blocked_until = max(self._blocked_until, now + int(h["retry-after"]))
+        except ValueError:
+            pass
+
+    def remaining(self, resource: str = "core", now: Optional[float] = None) -> Optional[int]:
+        """既知の残量（未観測、または reset 時刻を過ぎていれば None）。"""
+        now = time.time() if now is None else now
+        st = self._state.get(resource)
+        if not st or now >= st[2]:
+            return None
+        return st[0]
+
+    def background_allowed(self, resource: str = "core", now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if now < self._blocked_until:
+            return False
+        remaining = self.remaining(resource, now)
+        return remaining is None or remaining > self.reserve
+
+    def resume_at(self, resource: str = "core") -> float:
+        st = self._state.get(resource)
+        return max(self._blocked_until, float(st[2]) if st else 0.0)
+
+    def interval_factor(self, resource: str = "core", now: Optional[float] = None) -> int:
+        """バンドル更新間隔の倍率。予約分を除いた残りが半分を切るごとに倍にする（最大8倍）。"""
+        remaining = self.remaining(resource, now)
+        st = self._state.get(resource)
+        if remaining is None or not st or st[1] <= self.reserve:
+            return 1
+        ratio = (remaining - self.reserve) / (st[1] - self.reserve)
+        if ratio >= 0.5:
+            return 1
+        if ratio >= 0.25:
+            return 2
+        if ratio >= 0.125:
+            return 4
+        return 8
+
+    def skip_background(self, resource: str = "core") -> bool:
+        """バックグラウンド処理を見送るべきなら True（見送り回数も数える）。"""
+        if self.background_allowed(resource):
+            return False
+        self.stats["background_skips"] += 1
+        return True
+
+    def summary(self) -> str:
+        now = time.time()
+        parts = []
+        for resource, (remaining, limit, reset) in sorted(self._state.items()):
+            if now >= reset:
+                continue
+            state = "paused" if not self.background_allowed(resource, now) else f"x{self.interval_factor(resource, now)}"
+            parts.append(f"{resource}={remaining}/{limit} reset_in={int(reset - now)}s {state}")
+        if now < self._blocked_until:
+            parts.append(f"retry_after={int(self._blocked_until - now)}s")
+        st = self.stats
+        return (
+            (" ".join(parts) or "未観測") + f" | reserve={self.reserve} background_skips={st['background_skips']} "
+            f"limited={st['limited_responses']}"
+        )
+
+RATE_BUDGET = RateBudget(GH_RATE_RESERVE)
+
+def _sync_resource() -> str:
+    """ミラー同期が消費するレートのリソース名。"""
+    return "graphql" if GH_FETCH_MODE == "graphql" else "core"
+
+# ========= 条件付きリクエスト（ETag / Last-Modified） =========
+# 304 はレート制限に計上されないため、変化のない一覧は実質無料で再取得できる
+def _gh_cache_key(url: str) -> str:
+    # Link ヘッダの絶対URLと手組みの相対パスを同じキーに揃える
+    o = urllib.parse.urlparse(str(_gh_url(url)))
+    return o.path + (f"?{o.query}" if o.query else "")
+
+def _gh_path(path: str, params: Dict[str, Union[str, int]]) -> str:
+    return f"{path}?{urllib.parse.urlencode(sorted(params.items()))}" if params else path
+
+def _links(headers: Dict[str, str]) -> Dict[str, str]:
+    """Link ヘッダを rel -> URL に分解する（next / last など）。"""
+    out: Dict[str, str] = {}
+    for part in (headers.get("link") or "").split(","):
+        seg = part.split(";")
+        if len(seg) >= 2 and seg[1].strip().startswith("rel="):
+            out[seg[1].strip()[4:].strip('"')] = seg[0].strip()[1:-1]
+    return out
+
+_PAGE_PARAM_RE = re.compile(r"([?&])page=(\d+)")
+
+def _page_number(url: str) -> Optional[int]:
+    m = _PAGE_PARAM_RE.search(url)
+    return int(m.group(2)) if m else None
+
+def _with_page(url: str, page: int) -> str:
+    # GitHub が返した URL の並びを崩さず page だけ差し替える（キャッシュキーが逐次取得時と揃う）
+    return _PAGE_PARAM_RE.sub(lambda m: f"{m.group(1)}page={page}", url, count=1)
+
+async def http_cache_get(key: str) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], Optional[str], str]]:
+    async with db_read() as db:
+        cur = await db.execute("SELECT etag, last_modified, link_next, link_last, body FROM http_cache WHERE url=?", (key,))
+        row = await cur.fetchone()
+        return (row[0], row[1], row[2], row[3], row[4]) if row else None
+
+async def http_cache_put(
+    key: str, etag: Optional[str], last_modified: Optional[str], link_next: Optional[str], link_last: Optional[str], body: str
+):
+    now = int(time.time())
+    async with db_write() as db:
+        await db.execute(
+            "INSERT INTO http_cache (url, etag, last_modified, link_next, link_last, body, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET etag=excluded.etag, last_modified=excluded.last_modified, "
+            "link_next=excluded.link_next, link_last=excluded.link_last, body=excluded.body, fetched_at=excluded.fetched_at",
+            (key, etag, last_modified, link_next, link_last, body, now)
+        )
+        # since= 付きURLなど使われなくなったキーを掃除
+        await db.execute("DELETE FROM http_cache WHERE fetched_at < ?", (now - HTTP_CACHE_MAX_AGE_SEC,))
+
+async def http_cache_touch(key: str):
+    async with db_write() as db:
+        await db.execute("UPDATE http_cache SET fetched_at=? WHERE url=?", (int(time.time()), key))
+
+async def gh_get_json(url: str) -> Tuple[object, Optional[str], Optional[str]]:
+    """GET（条件付き）。(JSON, 次ページURL, 最終ページURL) を返す。304 なら保存済みの応答を返す。
+    同じURLへの同時リクエストは1本にまとめる。"""
+    key = _gh_cache_key(url)
+    return await single_flight(f"GET {key}", lambda: _gh_get_json(url, key))
+
+async def _gh_get_json(url: str, key: str) -> Tuple[object, Optional[str], Optional[str]]:
+    cached = await http_cache_get(key)
+    headers: Dict[str, str] = {}
+    if cached:
+        etag, last_modified, _, _, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    status, resp_headers, output = await gh_http("GET", url, headers=headers)
+    if status == 304 and cached:
+        await http_cache_touch(key)
+        return json.loads(cached[4]), cached[2], cached[3]
+    if status >= 400:
+        raise gh_error(status, resp_headers, output)
+    data = json.loads(output) if output else None
+    links = _links(resp_headers)
+    etag = resp_headers.get("etag")
+    last_modified = resp_headers.get("last-modified")
+    if etag or last_modified:
+        await http_cache_put(key, etag, last_modified, links.get("next"), links.get("last"), output)
+    return data, links.get("next"), links.get("last")
+
+_HOST_SLOTS: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+
+def _host_slots(url: str) -> asyncio.Semaphore:
+    # レーンごとに分ける。共有すると裏方のページ取得が枠を握ったまま裏方レーンの空きを待ち、コマンドが後ろに並ぶ
+    key = (GH_LANE.get(), _gh_url(url).host or "")
+    sem = _HOST_SLOTS.get(key)
+    if sem is None:
+        sem = _HOST_SLOTS[key] = asyncio.Semaphore(max(1, GH_PAGE_CONCURRENCY))
+    return sem
+
+async def _gh_get_page(url: str) -> List[Dict]:
+    await background_yield()  # 裏方はページごとにコマンドへ譲る
+    async with _host_slots(url):
+        data, _, _ = await gh_get_json(url)
+    return data or []
+
+async def gh_get_paginated(url: str, limit: Optional[int] = None) -> List[Dict]:
+    """
+    一覧を必要なページ数だけ取る。
+    - 1ページ目の Link ヘッダの rel="last" から総ページ数を知り、残りのページはレーン・ホストごとの上限内で並行に取る
+    - last が無い（カーソル方式など）ときは next を順にたどる
+    """
+    data, next_url, last_url = await gh_get_json(url)
+    out: List[Dict] = list(data or [])
+    last_page = _page_number(last_url) if last_url else None
+    if last_page and out and (limit is None or len(out) < limit):
+        pages = last_page if limit is None else min(last_page, -(-limit // len(out)))
+        for chunk in await asyncio.gather(*(_gh_get_page(_with_page(last_url, p)) for p in range(2, pages + 1))):
+            out.extend(chunk)
+        return out if limit is None else out[:limit]
+    while next_url and (limit is None or len(out) < limit):
+        await background_yield()
+        data, next_url, _ = await gh_get_json(next_url)
+        out.extend(data or [])
+    return out if limit is None else out[:limit]
+
 # ========= Due 抽出/強調 =========
-def parse_due(i: GH_Issue) -> Optional[date]:
-    if i.body:
-        for line in i.body.splitlines():
-            if line.strip().lower().startswith("due:"):
-                s = line.split(":", 1)[1].strip()
-                try:
-                    return datetime.strptime(s, "%Y-%m-%d").date()
-                except Exception:
-                    pass
-    for lab in i.labels:
-        n = lab.name.strip()
+_DUE_LINE_RE = re.compile(r"^[ \t]*due:(.*)$", re.IGNORECASE | re.MULTILINE)
+
+def parse_due(body: Optional[str], label_names: List[str]) -> Optional[date]:
+    """本文の `Due: YYYY-MM-DD` 行、なければ `due:YYYY-MM-DD` ラベル。IssueSnapshot を作る時に1回だけ呼ぶ。"""
+    if body:
+        # 本文全体を行分割せず、最初に読める Due 行で打ち切る
+        for m in _DUE_LINE_RE.finditer(body):
+            try:
+                return datetime.strptime(m.group(1).strip(), "%Y-%m-%d").date()
+            except Exception:
+                pass
+    for name in label_names:
+        n = name.strip()
         if n.lower().startswith("due:"):
             s = n.split(":", 1)[1].strip()
             try:
@@ -255,23 +894,40 @@ def parse_due(i: GH_Issue) -> Optional[date]:
                 continue
     return None
 
-def decorate_due_marker(i: GH_Issue) -> str:
-    d = parse_due(i)
-    if not d:
-        return ''
+# 緊急度: 0=期限超過 / 1=本日期限 / 2=3日以内 / 3=それ以外・未設定（並べ替えと表示で共用）
+DUE_MARKERS = {0: ' [期限超過]', 1: ' [本日期限]', 2: ' [期限迫る]', 3: ''}
+_URGENCY_CACHE: Dict[Tuple[int, datetime], Tuple[date, int]] = {}
+
+def due_urgency(i: "IssueSnapshot") -> int:
+    """(番号, updated_at) ごとに1日1回だけ計算する。Issue が更新されれば updated_at が変わり作り直される。"""
     today = date.today()
-    if d < today:
-        return ' [期限超過]'
-    if d == today:
-        return ' [本日期限]'
-    if (d - today).days <= 3:
-        return ' [期限迫る]'
-    return ''
+    key = (i.number, i.updated_at)
+    hit = _URGENCY_CACHE.get(key)
+    if hit and hit[0] == today:
+        return hit[1]
+    d = i.due
+    if not d:
+        u = 3
+    elif d < today:
+        u = 0
+    elif d == today:
+        u = 1
+    elif (d - today).days <= 3:
+        u = 2
+    else:
+        u = 3
+    if len(_URGENCY_CACHE) >= 4096:
+        _URGENCY_CACHE.clear()
+    _URGENCY_CACHE[key] = (today, u)
+    return u
+
+def decorate_due_marker(i: "IssueSnapshot") -> str:
+    return DUE_MARKERS[due_urgency(i)]
 
 
 
-def has_label(i: GH_Issue, name: str) -> bool:
-    return any(l.name.lower() == name.lower() for l in i.labels)
+def has_label(i: "IssueSnapshot", name: str) -> bool:
+    return any(l.lower() == name.lower() for l in i.labels)
 
 def ensure_status_labels(labels: List[str]) -> List[str]:
     has_status = any(l.lower().startswith("status:") for l in labels)
@@ -292,16 +948,15 @@ async def gh_create_issue_with_template(
     labels_csv: Optional[str],
     due: Optional[str],
     template_key: Optional[str],
-) -> GH_Issue:
+    client: Optional[discord.Client] = None,
+) -> "IssueSnapshot":
     """
     - template_key: bug/task/feature のいずれか。None ならテンプレ未使用。
     - labels_csv: "a,b,c" 形式 or None
     - due: "YYYY-MM-DD" or None
+    - client: 渡すと作成結果をミラーへ書き込み、該当バンドルを再描画させる
     """
-    def _work() -> GH_Issue:
-        g = gh_client()
-        repo = g.get_repo(f"{GH_OWNER}/{GH_REPO}")
-
+    def _build() -> Tuple[str, str, List[str]]:
         labels: List[str] = []
         if labels_csv:
             labels = [s.strip() for s in labels_csv.split(",") if s.strip()]
@@ -336,104 +991,562 @@ async def gh_create_issue_with_template(
         # ステータス保険
         labels = ensure_status_labels(labels)
 
-        # 実際の作成（ラベルは存在しなくても作成時に付く。未定義でもOK）
-        issue = repo.create_issue(
-            title=title_full,
-            body=body_full or None,
-            assignee=assignee or None,
-            labels=labels or None,
+        return title_full, body_full, labels
+
+    title_full, body_full, labels = _build()
+    # 実際の作成（ラベルは存在しなくても作成時に付く。未定義でもOK）
+    payload: Dict[str, object] = {"title": title_full}
+    if body_full:
+        payload["body"] = body_full
+    if assignee:
+        payload["assignee"] = assignee
+    if labels:
+        payload["labels"] = labels
+    snap = _mirror_issue_from_json(await gh_request_json("POST", f"/repos/{_repo_full_name()}/issues", payload))
+    try:
+        await write_through_issues([snap], client)
+    except Exception as e:
+        print("write-through error:", e)
+    return snap
+
+# ========= Issueミラー（SQLite） =========
+# 描画系は GitHub の Issue オブジェクトではなくこの不変スナップショットを扱う。
+# NamedTuple なので __slots__=() で属性辞書を持たず、requester も持たない（属性参照で API を叩くことがない）。
+# 本文は保持せず Due のみ取り込み時に抽出する。
+class IssueSnapshot(NamedTuple):
+    number: int
+    title: str
+    state: str
+    labels: Tuple[str, ...]
+    assignees: Tuple[str, ...]
+    due: Optional[date]
+    updated_at: datetime
+    html_url: str
+
+    @property
+    def assignee(self) -> Optional[str]:
+        return self.assignees[0] if self.assignees else None
+
+def _repo_full_name() -> str:
+    return f"{GH_OWNER}/{GH_REPO}"
+
+def _mirror_row(i: IssueSnapshot) -> Tuple:
+    return (
+        _repo_full_name(), i.number, i.title, i.state,
+        json.dumps(list(i.labels)), json.dumps(list(i.assignees)),
+        i.due.isoformat() if i.due else None,
+        i.updated_at.astimezone(timezone.utc).isoformat(),
+        i.html_url,
+    )
+
+def _mirror_from_row(row) -> IssueSnapshot:
+    number, title, state, labs, assg, due, updated, url = row
+    return IssueSnapshot(
+        number=int(number),
+        title=title,
+        state=state,
+        labels=tuple(json.loads(labs) if labs else []),
+        assignees=tuple(json.loads(assg) if assg else []),
+        due=date.fromisoformat(due) if due else None,
+        updated_at=datetime.fromisoformat(updated),
+        html_url=url,
+    )
+
+def _mirror_hwm_key() -> str:
+    return f"issue_mirror_hwm:{_repo_full_name()}"
+
+def _mirror_synced_key() -> str:
+    return f"issue_mirror_synced:{_repo_full_name()}"
+
+def _mirror_reconciled_key() -> str:
+    return f"issue_mirror_reconciled:{_repo_full_name()}"
+
+async def sync_state_get(key: str) -> Optional[str]:
+    async with db_read() as db:
+        cur = await db.execute("SELECT value FROM sync_state WHERE key=?", (key,))
+        row = await cur.fetchone()
+        return row[0] if row else None
+
+async def mirror_upsert(items: List[IssueSnapshot], state_updates: Dict[str, str]):
+    async with db_write() as db:
+        await db.executemany(
+            "INSERT INTO issue_mirror (repo, number, title, state, labels, assignees, due, updated_at, html_url) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(repo, number) DO UPDATE SET title=excluded.title, state=excluded.state, labels=excluded.labels, "
+            "assignees=excluded.assignees, due=excluded.due, updated_at=excluded.updated_at, html_url=excluded.html_url",
+            [_mirror_row(i) for i in items]
+        )
+        for k, v in state_updates.items():
+            await db.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (k, v)
+            )
+
+async def mirror_get(number: int) -> Optional[IssueSnapshot]:
+    async with db_read() as db:
+        cur = await db.execute(
+            "SELECT number, title, state, labels, assignees, due, updated_at, html_url FROM issue_mirror WHERE repo=? AND number=?",
+            (_repo_full_name(), int(number))
+        )
+        row = await cur.fetchone()
+        return _mirror_from_row(row) if row else None
+
+async def mirror_delete(number: int):
+    async with db_write() as db:
+        await db.execute("DELETE FROM issue_mirror WHERE repo=? AND number=?", (_repo_full_name(), int(number)))
+
+async def mirror_delete_missing_open(open_numbers: set, before: datetime) -> List[int]:
+    """open のはずが open_numbers に無い行を消す（before 以降に更新された行は一覧より新しいかもしれないので残す）。"""
+    async with db_write() as db:
+        cur = await db.execute(
+            "SELECT number, updated_at FROM issue_mirror WHERE repo=? AND state='open'", (_repo_full_name(),)
+        )
+        gone = [
+            int(n) for n, updated in await cur.fetchall()
+            if int(n) not in open_numbers and datetime.fromisoformat(updated) < before
+        ]
+        await db.executemany(
+            "DELETE FROM issue_mirror WHERE repo=? AND number=?", [(_repo_full_name(), n) for n in gone]
         )
-        return issue
+    return gone
 
-    return await asyncio.to_thread(_work)
+async def mirror_rename_label(old: str, new: Optional[str]) -> List[IssueSnapshot]:
+    """ラベルの改名/削除を反映（Issue の updated_at は変わらないため since 同期では拾えない）。new=None は削除。"""
+    async with db_write() as db:
+        cols = "number, title, state, labels, assignees, due, updated_at, html_url"
+        cur = await db.execute(
+            f"SELECT {cols} FROM issue_mirror WHERE repo=? AND labels LIKE ?",
+            (_repo_full_name(), f"%{json.dumps(old)}%")
+        )
+        changed: List[IssueSnapshot] = []
+        for row in await cur.fetchall():
+            issue = _mirror_from_row(row)
+            if old not in issue.labels:
+                continue
+            labels = tuple(l for l in issue.labels if l != old)
+            if new and new not in labels:
+                labels = labels + (new,)
+            changed.append(issue._replace(labels=labels))
+        for issue in changed:
+            await db.execute(
+                "UPDATE issue_mirror SET labels=? WHERE repo=? AND number=?",
+                (json.dumps(list(issue.labels)), _repo_full_name(), issue.number)
+            )
+        return changed
+
+def _mirror_issue_from_json(d: Dict) -> IssueSnapshot:
+    labels = tuple(l["name"] for l in d.get("labels") or [])
+    return IssueSnapshot(
+        number=int(d["number"]),
+        title=d["title"],
+        state=d["state"],
+        labels=labels,
+        assignees=tuple(a["login"] for a in d.get("assignees") or [] if a),
+        due=parse_due(d.get("body"), list(labels)),
+        updated_at=datetime.fromisoformat(d["updated_at"].replace("Z", "+00:00")),
+        html_url=d["html_url"],
+    )
+
+async def fetch_issue_updates_rest(since: Optional[datetime]) -> List[IssueSnapshot]:
+    """
+    - since=None: 初回。open/closed それぞれ更新順に MIRROR_INITIAL_LIMIT 件まで。
+    - since 指定: その時刻以降に更新された Issue を古い順に MIRROR_SYNC_BATCH 件まで（超過分は次回）。
+    ページ単位で条件付きリクエストを使う（変化がなければ 304）。
+    """
+    path = f"/repos/{_repo_full_name()}/issues"
+    if since is None:
+        # open と closed は並行に取る
+        urls = [_gh_path(path, {"state": state, "sort": "updated", "direction": "desc", "per_page": 100}) for state in ["open", "closed"]]
+        pages = await asyncio.gather(*(gh_get_paginated(url, MIRROR_INITIAL_LIMIT) for url in urls))
+        return [_mirror_issue_from_json(d) for items in pages for d in items]
+
+    since_s = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    url = _gh_path(path, {"state": "all", "since": since_s, "sort": "updated", "direction": "asc", "per_page": 100})
+    return [_mirror_issue_from_json(d) for d in await gh_get_paginated(url, MIRROR_SYNC_BATCH)]
+
+# --- GraphQL 版（描画に使う項目だけを要求。1クエリ最大100件、カーソルでページング）
+ISSUES_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String,
+      $states: [IssueState!], $since: DateTime, $direction: OrderDirection!) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: $states,
+           orderBy: {field: UPDATED_AT, direction: $direction},
+           filterBy: {since: $since}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        state
+        updatedAt
+        url
+        body
+        labels(first: 50) { nodes { name } }
+        assignees(first: 10) { nodes { login } }
+      }
+    }
+  }
+}
+"""
+
+def _mirror_issue_from_graphql(node: Dict) -> IssueSnapshot:
+    labels = tuple(l["name"] for l in (node.get("labels") or {}).get("nodes") or [] if l)
+    assignees = tuple(a["login"] for a in (node.get("assignees") or {}).get("nodes") or [] if a)
+    return IssueSnapshot(
+        number=int(node["number"]),
+        title=node["title"],
+        state=str(node["state"]).lower(),
+        labels=labels,
+        assignees=assignees,
+        due=parse_due(node.get("body"), list(labels)),
+        updated_at=datetime.fromisoformat(node["updatedAt"].replace("Z", "+00:00")),
+        html_url=node["url"],
+    )
+
+def _graphql_url() -> str:
+    # GHES は /api/v3 ではなく /api/graphql
+    return GH_API_URL[:-len("v3")] + "graphql" if GH_API_URL.endswith("/api/v3") else GH_API_URL + "/graphql"
+
+async def gh_graphql(query: str, variables: Dict) -> Dict:
+    status, headers, text = await gh_http("POST", _graphql_url(), payload={"query": query, "variables": variables})
+    data = json.loads(text) if text else {}
+    if status >= 400 or data.get("errors"):
+        raise gh_error(status if status >= 400 else 400, headers, text)
+    return data
+
+async def _graphql_issue_pages(states: Optional[List[str]], since: Optional[datetime], direction: str, limit: int) -> List[IssueSnapshot]:
+    out: List[IssueSnapshot] = []
+    after: Optional[str] = None
+    while len(out) < limit:
+        variables = {
+            "owner": GH_OWNER,
+            "name": GH_REPO,
+            "first": min(100, limit - len(out)),
+            "after": after,
+            "states": states,
+            "since": since.astimezone(timezone.utc).isoformat() if since else None,
+            "direction": direction,
+        }
+        data = await gh_graphql(ISSUES_GRAPHQL_QUERY, variables)
+        conn = data["data"]["repository"]["issues"]
+        out.extend(_mirror_issue_from_graphql(n) for n in conn["nodes"] if n)
+        page = conn["pageInfo"]
+        if not page["hasNextPage"]:
+            break
+        after = page["endCursor"]
+        await background_yield()
+    return out
 
-# ========= Issue取得/描画 =========
-def fetch_issues_sync(filters: List[str]) -> List[GH_Issue]:
-    g = gh_client()
-    repo = g.get_repo(f"{GH_OWNER}/{GH_REPO}")
+async def fetch_issue_updates_graphql(since: Optional[datetime]) -> List[IssueSnapshot]:
+    """fetch_issue_updates_rest の GraphQL 版（取得範囲・上限は同じ。Pull Request は含まず、条件付きリクエストは使えない）。"""
+    if since is None:
+        pages = await asyncio.gather(*(_graphql_issue_pages([state], None, "DESC", MIRROR_INITIAL_LIMIT) for state in ["OPEN", "CLOSED"]))
+        return [i for items in pages for i in items]
+    return await _graphql_issue_pages(None, since, "ASC", MIRROR_SYNC_BATCH)
 
-    # 明示ループで安全に上限を切る（スライス禁止）
-    issues: List[GH_Issue] = []
+async def _reconcile_open_issues(now: int):
+    """
+    削除・移管された Issue は since= 同期にも現れないので、MIRROR_RECONCILE_MIN 分ごとに
+    open の番号一覧と突き合わせてミラーから外す。一覧は条件付きリクエストなので、変化がなければ 304 で済む。
+    """
+    last = await sync_state_get(_mirror_reconciled_key())
+    if last and (now - int(last)) < MIRROR_RECONCILE_MIN * 60:
+        return
+    # 一覧を取っている間に開かれ、先にミラーへ入った Issue を消さないよう、時計のずれも見込んで余裕を取る
+    before = datetime.now(timezone.utc) - timedelta(minutes=5)
+    # 作成順は更新で並びが変わらないので、ページごとの 304 が効きやすい
+    url = _gh_path(f"/repos/{_repo_full_name()}/issues", {"state": "open", "sort": "created", "direction": "desc", "per_page": 100})
+    open_numbers = {int(d["number"]) for d in await gh_get_paginated(url)}
+    gone = await mirror_delete_missing_open(open_numbers, before)
+    await mirror_upsert([], {_mirror_reconciled_key(): str(now)})
+    if gone:
+        patch_board_snapshot(removals=gone)
+        print(f"issue mirror reconcile: removed {len(gone)} issues no longer open on GitHub")
+
+async def sync_issue_mirror(force: bool = False) -> int:
+    """GitHub から high-water mark 以降の更新だけを取り込む。取り込んだ件数を返す。"""
+    async with async_lock("mirror_sync"):
+        last = await sync_state_get(_mirror_synced_key())
+        now = int(time.time())
+        if not force and last and (now - int(last)) < MIRROR_SYNC_MIN_SEC:
+            return 0
+        # 明示の再同期（force）以外は、予約分に食い込むなら見送って手元のミラーで済ませる
+        if not force and RATE_BUDGET.skip_background(_sync_resource()):
+            return 0
+        hwm_s = await sync_state_get(_mirror_hwm_key())
+        since = datetime.fromisoformat(hwm_s) if hwm_s else None
+        if GH_FETCH_MODE == "graphql":
+            items = await fetch_issue_updates_graphql(since)
+        else:
+            items = await fetch_issue_updates_rest(since)
+        updates = {_mirror_synced_key(): str(now)}
+        if items:
+            hwm = max(i.updated_at for i in items)
+            if since is None or hwm > since:
+                updates[_mirror_hwm_key()] = hwm.astimezone(timezone.utc).isoformat()
+        await mirror_upsert(items, updates)
+        try:
+            await _reconcile_open_issues(now)
+        except Exception as e:
+            print("issue mirror reconcile error:", e)
+        return len(items)
 
-    for state in ["open", "closed"]:
-        pl = repo.get_issues(state=state, sort="updated", direction="desc")
-        fetched = 0
-        for it in pl:
-            issues.append(it)
-            fetched += 1
-            if fetched >= 200:
+async def load_mirror_issues() -> List[IssueSnapshot]:
+    async with db_read() as db:
+        cols = "number, title, state, labels, assignees, due, updated_at, html_url"
+        cur = await db.execute(
+            f"SELECT {cols} FROM issue_mirror WHERE repo=? AND state='open' ORDER BY updated_at DESC",
+            (_repo_full_name(),)
+        )
+        rows = list(await cur.fetchall())
+        cur = await db.execute(
+            f"SELECT {cols} FROM issue_mirror WHERE repo=? AND state='closed' ORDER BY updated_at DESC LIMIT ?",
+            (_repo_full_name(), MIRROR_CLOSED_LIMIT)
+        )
+        rows.extend(await cur.fetchall())
+    return [_mirror_from_row(r) for r in rows]
+
+# ========= 更新サイクル単位のスナップショット =========
+# 全チャンネル・全グループで1つの Issue 集合を共有し、ラベル絞り込みは手元で行う
+_BYTE_BITS = [[j for j in range(8) if v >> j & 1] for v in range(256)]
+
+def _bit_positions(bits: int) -> List[int]:
+    """立っているビット位置を昇順で（1バイトずつ表引き）。"""
+    out: List[int] = []
+    for k, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        if byte:
+            base = k * 8
+            out.extend(base + j for j in _BYTE_BITS[byte])
+    return out
+
+class BoardSnapshot:
+    """Issue 集合と、小文字ラベル名 → ビットセット（int）の転置索引。
+    各 Issue にスロット番号を振り、グループの AND 条件はビット積で求める。"""
+
+    def __init__(self, issues: List[IssueSnapshot], taken_at: float):
+        self.taken_at = taken_at
+        self._slots: List[Optional[IssueSnapshot]] = []
+        self._slot_of: Dict[int, int] = {}
+        self._initial = len(issues)  # これ以降のスロットは upsert で足したもの
+        self._label_bits: Dict[str, int] = {}
+        self._open_bits = 0
+        self._all_bits = 0
+        for issue in issues:
+            self._add(issue)
+
+    def _add(self, issue: IssueSnapshot):
+        slot = len(self._slots)
+        bit = 1 << slot
+        self._slots.append(issue)
+        self._slot_of[issue.number] = slot
+        self._all_bits |= bit
+        for name in issue.labels:
+            key = name.lower()
+            self._label_bits[key] = self._label_bits.get(key, 0) | bit
+        if issue.state == "open":
+            self._open_bits |= bit
+
+    @property
+    def issues(self) -> List[IssueSnapshot]:
+        return self.from_mask(self._all_bits)
+
+    def upsert(self, issue: IssueSnapshot):
+        self.remove(issue.number)
+        self._add(issue)
+
+    def remove(self, number: int):
+        slot = self._slot_of.pop(number, None)
+        if slot is None:
+            return
+        old = self._slots[slot]
+        self._slots[slot] = None
+        keep = ~(1 << slot)
+        self._all_bits &= keep
+        self._open_bits &= keep
+        for name in old.labels:
+            key = name.lower()
+            bits = self._label_bits.get(key, 0) & keep
+            if bits:
+                self._label_bits[key] = bits
+            else:
+                self._label_bits.pop(key, None)
+
+    def mask(self, filters: List[str], *, include_closed: bool = True) -> int:
+        """filters（大文字小文字は区別しない）を全て持つ Issue のビット集合。"""
+        bits = self._all_bits if include_closed else self._open_bits
+        for f in filters:
+            bits &= self._label_bits.get(f.lower(), 0)
+            if not bits:
                 break
+        return bits
 
-    if filters:
-        def match_filters(issue: GH_Issue) -> bool:
-            names = {l.name for l in issue.labels}
-            return all(f in names for f in filters)
-        issues = [x for x in issues if match_filters(x)]
+    def from_mask(self, bits: int) -> List[IssueSnapshot]:
+        slots = _bit_positions(bits)
+        if len(self._slots) > self._initial:
+            # upsert 分は末尾のスロットにあり、新しいものほど先頭に表示する
+            k = bisect.bisect_left(slots, self._initial)
+            slots = slots[k:][::-1] + slots[:k]
+        return [self._slots[i] for i in slots]
 
-    return issues
+    def select(self, filters: List[str], *, include_closed: bool = True) -> List[IssueSnapshot]:
+        return self.from_mask(self.mask(filters, include_closed=include_closed))
 
-def _shorten_title(title: str, limit: int = 70) -> str:
-    return title if len(title) <= limit else title[: limit - 1] + '…'
+_BOARD_SNAPSHOT: Optional[BoardSnapshot] = None
 
+async def get_board_snapshot(force: bool = False) -> BoardSnapshot:
+    """
+    - force=False: SNAPSHOT_TTL_SEC 以内の既存スナップショットを返す。
+    - force=True: ミラーを同期して取り直す（periodic_refresh の1ティックに1回）。
+    """
+    snap = _BOARD_SNAPSHOT
+    if not force and snap and (time.monotonic() - snap.taken_at) < SNAPSHOT_TTL_SEC:
+        return snap
+    # 取り直しが実行中ならそれに相乗りする（同期付きの取り直しには通常の呼び出しも相乗り可）
+    if force or single_flight_pending("board_snapshot:sync"):
+        return await single_flight("board_snapshot:sync", lambda: _take_board_snapshot(True))
+    return await single_flight("board_snapshot", lambda: _take_board_snapshot(False))
+
+async def _take_board_snapshot(force: bool) -> BoardSnapshot:
+    global _BOARD_SNAPSHOT
+    async with async_lock("board_snapshot"):
+        now = time.monotonic()
+        # 同期失敗時も手元のミラーで描画を続ける
+        try:
+            await sync_issue_mirror(force=force)
+        except Exception as e:
+            print("issue mirror sync error:", e)
+        _BOARD_SNAPSHOT = BoardSnapshot(await load_mirror_issues(), now)
+        return _BOARD_SNAPSHOT
+
+def patch_board_snapshot(upserts: List[IssueSnapshot] = (), removals: List[int] = ()):
+    """ミラーへ直接反映した変更を手元のスナップショットにも当てる（GitHub への再取得なし）。"""
+    snap = _BOARD_SNAPSHOT
+    if snap is None:
+        return
+    for n in removals:
+        snap.remove(n)
+    for issue in upserts:
+        snap.upsert(issue)
 
-def _format_updated_jst(dt: datetime) -> Tuple[str, str]:
-    aware = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-    jst_dt = aware.astimezone(JST)
-    delta = datetime.now(JST) - jst_dt
-    if delta.total_seconds() < 0:
-        rel = '未来'
-    elif delta.days > 0:
-        rel = f"{delta.days}日前"
-    else:
-        hours = delta.seconds // 3600
-        if hours > 0:
-            rel = f"{hours}時間前"
-        else:
-            minutes = (delta.seconds % 3600) // 60
-            rel = f"{minutes}分前" if minutes > 0 else 'たった今'
-    return (jst_dt.strftime('%Y-%m-%d %H:%M'), rel)
+async def write_through_issues(items: List[IssueSnapshot], client: Optional[discord.Client] = None) -> set:
+    """
+    手元で得た最新の Issue 状態（変更操作の応答や Webhook）をミラーとスナップショットへ反映する。
+    新旧どちらかのラベル集合にマッチするグループを持つチャンネルIDを返し、client があれば再描画対象にする。
+    """
+    changed: List[IssueSnapshot] = []
+    label_sets: List[Tuple[str, ...]] = []
+    for new in items:
+        old = await mirror_get(new.number)
+        if old is not None and (old == new or old.updated_at > new.updated_at):
+            continue  # 変化なし、または既により新しい状態を持っている
+        changed.append(new)
+        label_sets.append(new.labels)
+        if old is not None:
+            label_sets.append(old.labels)
+    if not changed:
+        return set()
+    await mirror_upsert(changed, {})
+    patch_board_snapshot(upserts=changed)
+    channels = await channels_for_label_sets(label_sets)
+    if client is not None and hasattr(client, "mark_bundles_dirty"):
+        client.mark_bundles_dirty(channels, now=True)
+    return channels
+
+# ========= Issue描画 =========
+def _shorten_title(title: str, limit: int = 70) -> str:
+    return title if len(title) <= limit else title[: limit - 1] + '…'
 
 
-def render_issue_block(i: GH_Issue) -> str:
+def _relative_bucket(updated_ts: float, now_ts: float) -> Tuple[str, float]:
+    """相対時刻の表記と、その表記が次に変わる時刻（epoch 秒）。"""
+    delta = now_ts - updated_ts
+    if delta < 0:
+        return '未来', updated_ts
+    if delta >= 86400:
+        days = int(delta // 86400)
+        return f"{days}日前", updated_ts + (days + 1) * 86400
+    if delta >= 3600:
+        hours = int(delta // 3600)
+        return f"{hours}時間前", updated_ts + (hours + 1) * 3600
+    minutes = int(delta // 60)
+    return (f"{minutes}分前" if minutes > 0 else 'たった今'), updated_ts + (minutes + 1) * 60
+
+
+# --- 描画結果のキャッシュ（LRU）
+# (番号, updated_at, 描画スタイル) ごとに「相対時刻の前後の固定部分」を保持し、
+# 相対時刻は表記が変わる時刻を過ぎた時だけ作り直す。
+RENDER_CACHE_MAX = 4096
+_RENDER_CACHE: "OrderedDict[Tuple[int, datetime, str], List]" = OrderedDict()
+RENDER_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "rel_updates": 0}
+
+def _render_cached(i: IssueSnapshot, style: str, build: Callable[[IssueSnapshot], Tuple[str, str]]) -> str:
+    now = time.time()
+    key = (i.number, i.updated_at, style)
+    urgency = due_urgency(i)
+    ent = _RENDER_CACHE.get(key)
+    # ラベル名変更などは updated_at を伴わないことがあるため、元のスナップショットとも突き合わせる
+    if ent is not None and (ent[0] is i or ent[0] == i) and ent[1] == urgency:
+        RENDER_CACHE_STATS["hits"] += 1
+        _RENDER_CACHE.move_to_end(key)
+        if now >= ent[5]:
+            rel, ent[5] = _relative_bucket(i.updated_at.timestamp(), now)
+            if rel != ent[4]:
+                RENDER_CACHE_STATS["rel_updates"] += 1
+                ent[4] = rel
+                ent[6] = ent[2] + rel + ent[3]
+        return ent[6]
+    RENDER_CACHE_STATS["misses"] += 1
+    head, tail = build(i)
+    rel, until = _relative_bucket(i.updated_at.timestamp(), now)
+    # [issue, urgency, head, tail, rel, rel が変わる時刻, 結果]
+    _RENDER_CACHE[key] = [i, urgency, head, tail, rel, until, head + rel + tail]
+    _RENDER_CACHE.move_to_end(key)
+    while len(_RENDER_CACHE) > RENDER_CACHE_MAX:
+        _RENDER_CACHE.popitem(last=False)
+    return head + rel + tail
+
+
+def _build_issue_block(i: IssueSnapshot) -> Tuple[str, str]:
     title = _shorten_title(i.title)
-    assignee = f"@{i.assignee.login}" if i.assignee else '未割当'
-    due = parse_due(i)
+    assignee = f"@{i.assignee}" if i.assignee else '未割当'
+    due = i.due
     due_text = due.isoformat() if due else '未設定'
     mark = decorate_due_marker(i)
-    updated_text, updated_rel = _format_updated_jst(i.updated_at)
+    updated_text = i.updated_at.astimezone(JST).strftime('%Y-%m-%d %H:%M')
     meta_parts = [
         f"担当:{assignee}",
         f"期限:{due_text}{mark}",
-        f"更新:{updated_text}({updated_rel})",
+        f"更新:{updated_text}(",
     ]
     line1 = f"> `#{i.number}` {title}"
     line2 = f"> {' | '.join(meta_parts)}"
     line3 = f"> {i.html_url}"
-    return '\n'.join([line1, line2, line3])
+    return '\n'.join([line1, line2]), ')\n' + line3
 
-T = TypeVar('T')
+def render_issue_block(i: IssueSnapshot) -> str:
+    return _render_cached(i, "block", _build_issue_block)
 
 def chunk_list(items: List[T], size: int) -> List[List[T]]:
     if size <= 0:
         raise ValueError("size must be positive")
     return [items[i:i + size] for i in range(0, len(items), size)]
 
-def _status_from_issue(issue: GH_Issue) -> str:
-    for label in issue.labels:
-        name = label.name
+def _status_from_issue(issue: IssueSnapshot) -> str:
+    for name in issue.labels:
         if name.lower().startswith("status:"):
             return name.split(":", 1)[1]
     return issue.state
 
-def format_task_list_entry(issue: GH_Issue) -> str:
+def _build_task_list_entry(issue: IssueSnapshot) -> Tuple[str, str]:
     title = _shorten_title(issue.title)
     mark = decorate_due_marker(issue)
-    assignee = f"@{issue.assignee.login}" if issue.assignee else "未割当"
-    due = parse_due(issue)
+    assignee = f"@{issue.assignee}" if issue.assignee else "未割当"
+    due = issue.due
     due_text = due.isoformat() if due else "未設定"
-    _, updated_rel = _format_updated_jst(issue.updated_at)
     status_text = _status_from_issue(issue)
-    return f"[#{issue.number}]({issue.html_url}) {title}{mark} | 状態:{status_text} | 担当:{assignee} | 期限:{due_text} | 更新:{updated_rel}"
+    return f"[#{issue.number}]({issue.html_url}) {title}{mark} | 状態:{status_text} | 担当:{assignee} | 期限:{due_text} | 更新:", ""
+
+def format_task_list_entry(issue: IssueSnapshot) -> str:
+    return _render_cached(issue, "task_list", _build_task_list_entry)
 
 def build_task_list_embed(page_items: List[str], page_idx: int, page_total: int, title: str) -> discord.Embed:
     description = "\n".join(f"- {item}" for item in page_items) if page_items else "該当なし"
@@ -490,16 +1603,255 @@ class TaskListView(discord.ui.View):
         new_msg = await self.bot._send_task_list_embed(channel, self.entries, self.title, page_idx=self.page_idx, per_page=self.per_page)
         await interaction.followup.send(f"最新を最下部に再掲しました: [jump]({new_msg.jump_url})", ephemeral=True)
 
-async def run_issue_action(number: int, action: Callable[[GH_Issue], T]) -> T:
-    def _work():
-        repo = gh_client().get_repo(f"{GH_OWNER}/{GH_REPO}")
-        issue = repo.get_issue(number)
-        return action(issue)
-    return await asyncio.to_thread(_work)
+# --- 変更操作（差分だけを送る）
+# ラベル/担当者は全置換の PATCH を使わず、追加・削除の差分だけを送る。
+# ミラーの状態が少し古くても、その間に GitHub 側で付いたラベルや担当者を消してしまうことがない。
+class IssueMutation(NamedTuple):
+    result: object                           # コマンドへ返す値
+    status: Optional[str] = None             # 付け替える status:* ラベル（他の status:* は外す）
+    add_labels: Tuple[str, ...] = ()
+    remove_labels: Tuple[str, ...] = ()
+    add_assignees: Tuple[str, ...] = ()
+    remove_assignees: Tuple[str, ...] = ()
+    state: Optional[str] = None              # "open" / "closed"（None なら変えない）
+    comment: Optional[str] = None            # 変更がすべて成功した後に投稿するコメント
+
+    def has_writes(self) -> bool:
+        return bool(
+            self.status or self.add_labels or self.remove_labels
+            or self.add_assignees or self.remove_assignees or self.state
+        )
+
+MUTATION_STATS: Dict[str, int] = {"cached": 0, "fetched": 0, "requests": 0, "conflict_retries": 0}
+
+async def gh_request_json(verb: str, path: str, payload: Optional[Dict] = None) -> Dict:
+    """条件付きキャッシュを通さない GitHub API 呼び出し（変更系・強制取得用）。"""
+    status, headers, text = await gh_http(verb, path, payload=payload)
+    if status >= 400:
+        raise gh_error(status, headers, text)
+    return json.loads(text) if text else {}
+
+async def _mirror_fresh_enough() -> bool:
+    last = await sync_state_get(_mirror_synced_key())
+    if not last:
+        return False
+    # Webhook 有効時は変更が逐次届くので、突き合わせ間隔までは信用する
+    max_age = WEBHOOK_RECONCILE_MIN * 60 if WEBHOOK_SECRET else MUTATION_CACHE_MAX_AGE_SEC
+    return time.time() - int(last) <= max_age
+
+async def _fetch_issue_snapshot(number: int) -> IssueSnapshot:
+    MUTATION_STATS["fetched"] += 1
+    return _mirror_issue_from_json(await gh_request_json("GET", f"/repos/{_repo_full_name()}/issues/{number}"))
+
+async def _mutation_request(verb: str, path: str, payload: Optional[Dict] = None, missing_ok: bool = False):
+    MUTATION_STATS["requests"] += 1
+    try:
+        return await gh_request_json(verb, path, payload)
+    except GithubException as e:
+        # 付いていないラベル/担当者の削除は 404。差分として既に満たされているので無視する
+        if missing_ok and e.status == 404:
+            return None
+        raise
+
+def _other_status_labels(labels, status: str) -> List[str]:
+    return [l for l in labels if l.lower().startswith("status:") and l.lower() != status.lower()]
+
+async def _apply_issue_mutation(number: int, current: IssueSnapshot, m: IssueMutation) -> Optional[IssueSnapshot]:
+    """
+    差分を GitHub へ並行に送り、変更後の Issue を返す（変更が無ければ None）。取り直しの GET はしない。
+    付け替える status:* は current のラベルから決めて追加と同時に外し、追加の応答（全ラベル）に
+    current に無かった status:* が残っていればそれも外す。
+    """
+    if not m.has_writes():
+        return None
+    path = f"/repos/{_repo_full_name()}/issues/{number}"
+    add = ([m.status] if m.status else []) + list(m.add_labels)
+    removes = list(m.remove_labels) + (_other_status_labels(current.labels, m.status) if m.status else [])
+
+    def delete_labels(names):
+        return [_mutation_request("DELETE", f"{path}/labels/{urllib.parse.quote(n, safe='')}", missing_ok=True) for n in names]
+
+    ops: Dict[str, Awaitable] = {}
+    if add:
+        ops["labels"] = _mutation_request("POST", f"{path}/labels", {"labels": add})
+    if m.add_assignees:
+        ops["assign"] = _mutation_request("POST", f"{path}/assignees", {"assignees": list(m.add_assignees)})
+    if m.remove_assignees:
+        ops["unassign"] = _mutation_request("DELETE", f"{path}/assignees", {"assignees": list(m.remove_assignees)})
+    if m.state:
+        ops["state"] = _mutation_request("PATCH", path, {"state": m.state})
+    results = await asyncio.gather(*ops.values(), *delete_labels(removes))
+    res = dict(zip(ops, results))
+
+    labels: Optional[List[str]] = None
+    if isinstance(res.get("labels"), list):
+        labels = [l["name"] for l in res["labels"]]
+        # キャッシュが古く、知らない status:* が付いていた場合だけ追加で外す
+        removed = {n.lower() for n in removes}
+        extra = [n for n in _other_status_labels(labels, m.status) if n.lower() not in removed] if m.status else []
+        await asyncio.gather(*delete_labels(extra))
+        removes += extra
+
+    # 応答に Issue 全体があればそれを、無ければ current を土台に、送った差分を当てて変更後の状態とする
+    # （並行に送った各応答は互いの変更を含むとは限らないため、どの土台にも差分を当て直す）
+    full = next((res[k] for k in ("state", "unassign", "assign") if isinstance(res.get(k), dict) and res[k]), None)
+    base = _mirror_issue_from_json(full) if full else current
+    removed = {n.lower() for n in removes}
+    if labels is None:
+        labels = list(base.labels) + [n for n in add if n.lower() not in {l.lower() for l in base.labels}]
+    labels = [l for l in labels if l.lower() not in removed]
+    unassigned = {a.lower() for a in m.remove_assignees}
+    assignees = [a for a in base.assignees if a.lower() not in unassigned]
+    assignees += [a for a in m.add_assignees if a.lower() not in {x.lower() for x in assignees}]
+    return base._replace(
+        state=m.state or base.state,
+        labels=tuple(labels),
+        assignees=tuple(assignees),
+        due=base.due or parse_due(None, labels),  # 本文は手元に無いことがあるので、期限ラベルの追加だけ拾う
+        updated_at=max(base.updated_at, current.updated_at),
+    )
+
+async def run_issue_mutation(
+    number: int,
+    plan: Callable[[IssueSnapshot], IssueMutation],
+    client: Optional[discord.Client] = None,
+) -> object:
+    """
+    plan(現在の Issue) が返す差分を送る。
+    - 現在の状態は、同期が新しければミラーから取り（GET なし）、なければ GET する
+    - ラベル/担当者の追加・削除と状態の PATCH は並行に送る。キャッシュ由来で 409/422 になった場合だけ
+      GET し直して1回やり直す（差分なので送り直しても二重にはならない）
+    - コメントは変更がすべて成功してから投稿する（失敗した変更を報告するコメントを残さない）
+    - 変更後の Issue は応答と差分から組み立て、ミラー/スナップショットへ書き込んで該当バンドルを再描画させる
+    """
+    current = await mirror_get(number) if await _mirror_fresh_enough() else None
+    from_cache = current is not None
+    if from_cache:
+        MUTATION_STATS["cached"] += 1
+    else:
+        current = await _fetch_issue_snapshot(number)
+    m = plan(current)
+
+    try:
+        updated = await _apply_issue_mutation(number, current, m)
+    except GithubException as e:
+        if not (from_cache and e.status in (409, 422)):
+            raise
+        MUTATION_STATS["conflict_retries"] += 1
+        current = await _fetch_issue_snapshot(number)
+        from_cache = False
+        m = plan(current)
+        updated = await _apply_issue_mutation(number, current, m)
+    if m.comment is not None:
+        await _mutation_request("POST", f"/repos/{_repo_full_name()}/issues/{number}/comments", {"body": m.comment})
+
+    try:
+        if updated is not None:
+            await write_through_issues([updated], client)
+        elif not from_cache:
+            # 編集なしでも、取ってきた最新状態はミラーへ入れておく
+            await write_through_issues([current], client)
+    except Exception as e:
+        print("write-through error:", e)
+    return m.result
+
+# --- 一括操作（`12,15,20-24` のような番号指定）
+def parse_issue_numbers(raw: str) -> List[int]:
+    """カンマ/空白区切りの番号と範囲を展開（重複は除き、指定順を保つ）。不正なら ValueError。"""
+    out: List[int] = []
+    seen = set()
+    for tok in re.split(r"[,\s]+", (raw or "").strip()):
+        if not tok:
+            continue
+        a, sep, b = tok.partition("-")
+        try:
+            lo = int(a.lstrip("#"))
+            hi = int(b.lstrip("#")) if sep else lo
+        except ValueError:
+            raise ValueError(f"'{tok}' は番号として読めません")
+        if lo <= 0 or hi <= 0:
+            raise ValueError(f"'{tok}' は番号として読めません")
+        if lo > hi:
+            lo, hi = hi, lo
+        if hi - lo + 1 > BULK_MAX_ISSUES:
+            raise ValueError(f"一度に指定できるのは {BULK_MAX_ISSUES} 件までです")
+        for n in range(lo, hi + 1):
+            if n not in seen:
+                seen.add(n)
+                out.append(n)
+    if not out:
+        raise ValueError("番号が指定されていません")
+    if len(out) > BULK_MAX_ISSUES:
+        raise ValueError(f"一度に指定できるのは {BULK_MAX_ISSUES} 件までです")
+    return out
+
+def same_labels(a: List[str], b: List[str]) -> bool:
+    return {l.lower() for l in a} == {l.lower() for l in b}
+
+async def run_bulk_issue_action(
+    numbers: List[int],
+    plan: Callable[[IssueSnapshot], IssueMutation],
+    client: Optional[discord.Client] = None,
+) -> List[Tuple[int, str, str]]:
+    """
+    各 Issue に plan を BULK_CONCURRENCY 並列で適用する。plan の result は (状態, URL)。
+    直近の応答ヘッダの残りレートが BULK_RATE_RESERVE を下回ったら、以降は実行せず rate_limited とする。
+    """
+    sem = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def one(number: int) -> Tuple[int, str, str]:
+        async with sem:
+            remaining = RATE_BUDGET.remaining("core")
+            if remaining is not None and remaining < BULK_RATE_RESERVE:
+                return (number, "rate_limited", "")
+            try:
+                state, url = await run_issue_mutation(number, plan, client)
+                return (number, state, url)
+            except GithubException as e:
+                return (number, "error", f"GitHubエラー {e.status}")
+            except Exception as e:
+                return (number, "error", str(e))
+
+    return list(await asyncio.gather(*(one(n) for n in numbers)))
+
+BULK_STATE_TEXT = {"changed": "更新", "noop": "変更なし", "rate_limited": "未実行（レート制限）", "error": "失敗"}
+
+def format_bulk_summary(title: str, results: List[Tuple[int, str, str]]) -> str:
+    by_state: Dict[str, List[Tuple[int, str]]] = {}
+    for number, state, detail in sorted(results):
+        by_state.setdefault(state, []).append((number, detail))
+    head = f"{title}: " + " / ".join(
+        f"{BULK_STATE_TEXT.get(k, k)} {len(by_state[k])}件" for k in BULK_STATE_TEXT if k in by_state
+    )
+    lines = [head]
+    for state in ("changed", "noop", "rate_limited"):
+        if state in by_state:
+            lines.append(f"{BULK_STATE_TEXT[state]}: " + ", ".join(f"#{n}" for n, _ in by_state[state]))
+    for number, detail in by_state.get("error", []):
+        lines.append(f"失敗 #{number}: {detail}")
+    text = "\n".join(lines)
+    return text if len(text) <= DISCORD_MSG_LIMIT else text[:DISCORD_MSG_LIMIT - 1] + "…"
+
+def done_comment(user_display: str, memo: str, closed: bool) -> str:
+    comment_lines = [f"[done] Discordから完了処理 (by {user_display})"]
+    if memo:
+        comment_lines.append("")
+        comment_lines.append(memo)
+    if closed:
+        comment_lines.append("")
+        comment_lines.append("IssueをCloseしました。")
+    return "\n".join(comment_lines)
+
+def claim_comment(login: str, user_display: str, memo: str) -> str:
+    comment_lines = [f"[claim] {login} が担当を宣言 (by {user_display})"]
+    if memo:
+        comment_lines.append("")
+        comment_lines.append(memo)
+    return "\n".join(comment_lines)
 
 
 async def get_linked_login(discord_user_id: int) -> Optional[str]:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with db_read() as db:
         cur = await db.execute(
             "SELECT github_login FROM user_link WHERE discord_user_id=?",
             (int(discord_user_id),)
@@ -537,32 +1889,19 @@ def remove_label(labels: List[str], target: str) -> List[str]:
 
 
 
-async def build_group_section(title: str, filters: List[str]) -> str:
-    issues = await asyncio.to_thread(lambda: fetch_issues_sync(filters))
-
-    def overdue_rank(i: GH_Issue) -> int:
-        d = parse_due(i)
-        if not d:
-            return 3
-        today = date.today()
-        if d < today:
-            return 0
-        if d == today:
-            return 1
-        if (d - today).days <= 3:
-            return 2
-        return 3
+async def build_group_section(title: str, filters: List[str], snapshot: Optional[BoardSnapshot] = None) -> str:
+    snap = snapshot or await get_board_snapshot()
 
-    doing = [i for i in issues if i.state == 'open' and has_label(i, 'status:in_progress')]
-    todo = [i for i in issues if i.state == 'open' and has_label(i, 'status:todo')]
+    doing = snap.select(filters + ['status:in_progress'], include_closed=False)
+    todo = snap.select(filters + ['status:todo'], include_closed=False)
 
-    doing.sort(key=lambda i: (overdue_rank(i), i.updated_at))
-    todo.sort(key=lambda i: (overdue_rank(i), i.updated_at))
+    doing.sort(key=lambda i: (due_urgency(i), i.updated_at))
+    todo.sort(key=lambda i: (due_urgency(i), i.updated_at))
 
     doing = doing[:MAX_PER_SECTION]
     todo = todo[:MAX_PER_SECTION]
 
-    def render_group(label: str, items: List[GH_Issue]) -> str:
+    def render_group(label: str, items: List[IssueSnapshot]) -> str:
         header = f"**{label}** ({len(items)}件)"
         if not items:
             return "\n".join([header, "> 該当なし"])
@@ -589,43 +1928,158 @@ async def build_group_section(title: str, filters: List[str]) -> str:
 
 
 
-async def build_bundle_content(channel_id: int) -> str:
+# 時刻だけが変わる行（内容比較から除外）
+VOLATILE_LINE_PREFIXES = ("_section updated:", "— **最終更新**:")
+
+def bundle_content_hash(content: str) -> str:
+    lines = [l for l in content.splitlines() if not l.startswith(VOLATILE_LINE_PREFIXES)]
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+def paginate_bundle(sections: List[str], footer: str, limit: int = DISCORD_MSG_LIMIT) -> List[str]:
+    """
+    セクションを順に詰めてメッセージ単位に分ける。1セクションが収まらない場合は
+    Issue ブロック（空行区切り）の境目で分割し、続きの先頭に見出しを付け直す。
+    フッタは最後のメッセージに付く（全ページでその分の余白を確保）。
+    """
+    room = limit - len(footer)
+    pages: List[str] = []
+    cur = ""
+
+    def flush():
+        nonlocal cur
+        if cur:
+            pages.append(cur)
+            cur = ""
+
+    for sec in sections:
+        if cur and len(cur) + 2 + len(sec) <= room:
+            cur = f"{cur}\n\n{sec}"
+            continue
+        flush()
+        if len(sec) <= room:
+            cur = sec
+            continue
+        title = sec.split("\n", 1)[0]
+        for para in sec.split("\n\n"):
+            if len(para) > room:
+                para = para[: room - 20] + "\n…(省略)"
+            if cur and len(cur) + 2 + len(para) <= room:
+                cur = f"{cur}\n\n{para}"
+            else:
+                flush()
+                cont = f"{title} (続き)\n{para}" if pages and not para.startswith(title) else para
+                cur = cont if len(cont) <= room else para
+    flush()
+
+    if not pages:
+        pages = [""]
+    if len(pages) > MAX_BUNDLE_MESSAGES:
+        pages = pages[:MAX_BUNDLE_MESSAGES]
+        pages[-1] = pages[-1][: room - 20] + "\n…(省略)"
+    pages[-1] = pages[-1] + footer
+    return pages
+
+async def build_bundle_pages(channel_id: int, snapshot: Optional[BoardSnapshot] = None) -> List[str]:
     groups = await list_bundle_groups(channel_id)
     if not groups:
-        return "*（このチャンネルにはグループがありません。`/task_group_add` または `/task_group_add_modal` で追加してください）*"
+        return ["*（このチャンネルにはグループがありません。`/task_group_add` または `/task_group_add_modal` で追加してください）*"]
 
+    snap = snapshot or await get_board_snapshot()
     sections: List[str] = []
     for name, filters in groups:
-        sections.append(await build_group_section(name, filters))
-
-    content = "\n\n".join(sections)
+        sections.append(await build_group_section(name, filters, snap))
 
     # ★ バンドル最終更新（JST）
     footer = f"\n\n— **最終更新**: {now_jst_str()}"
-    content = content + footer
-
-    if len(content) <= DISCORD_MSG_LIMIT:
-        return content
-    return content[: DISCORD_MSG_LIMIT - 20] + "\n…(省略)"
+    return paginate_bundle(sections, footer)
 
 # ========= 入力簡略化（ラベル補完/ショートカット） =========
-_LABEL_CACHE: Dict[str, List[str]] = {}
+# --- 補完用の索引（候補リストが差し替わった時だけ作り直す）
+class CompletionIndex:
+    """小文字化済みキーの前方一致（二分探索）と、1〜3 文字 n-gram の転置リストを持つ。
+    順位は 前方一致 → 部分一致（出現位置が前ほど上）→ あいまい一致（共有 trigram 数）。"""
+
+    def __init__(self, values: List[str]):
+        self.source = values
+        self.values = list(values)
+        self.lower = [v.lower() for v in self.values]
+        order = sorted(range(len(self.lower)), key=lambda i: (self.lower[i], i))
+        self._sorted_keys = [self.lower[i] for i in order]
+        self._sorted_idx = order
+        self._grams: Dict[str, List[int]] = {}
+        for i, low in enumerate(self.lower):
+            grams = {low[a:a + n] for n in (1, 2, 3) for a in range(len(low) - n + 1)}
+            for g in grams:
+                self._grams.setdefault(g, []).append(i)
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        q = (query or "").strip().lower()
+        if not q:
+            return self.values[:limit]
+        out: List[int] = []
+        seen = set()
+
+        def take(idxs) -> bool:
+            for i in idxs:
+                if i not in seen:
+                    seen.add(i)
+                    out.append(i)
+                    if len(out) >= limit:
+                        return True
+            return False
+
+        # 1) 前方一致
+        pos = bisect.bisect_left(self._sorted_keys, q)
+        prefix = []
+        while pos < len(self._sorted_keys) and self._sorted_keys[pos].startswith(q) and len(prefix) < limit:
+            prefix.append(self._sorted_idx[pos])
+            pos += 1
+        if take(prefix):
+            return [self.values[i] for i in out]
+
+        # 2) 部分一致（最も短い転置リストから候補を絞って確認）
+        grams = [q] if len(q) <= 3 else list({q[a:a + 3] for a in range(len(q) - 2)})
+        postings = sorted((self._grams.get(g, []) for g in grams), key=len)
+        if postings[0]:
+            sub = [i for i in postings[0] if q in self.lower[i]]
+            sub.sort(key=lambda i: (self.lower[i].find(q), len(self.lower[i]), i))
+            if take(sub):
+                return [self.values[i] for i in out]
+
+        # 3) あいまい一致（typo 等。クエリの trigram の半分以上を共有するもの）
+        if len(q) > 3:
+            hits: Dict[int, int] = {}
+            for p in postings:
+                for i in p:
+                    hits[i] = hits.get(i, 0) + 1
+            need = (len(grams) + 1) // 2
+            fuzzy = [i for i, n in hits.items() if n >= need]
+            fuzzy.sort(key=lambda i: (-hits[i], abs(len(self.lower[i]) - len(q)), i))
+            take(fuzzy)
+        return [self.values[i] for i in out]
+
+_COMPLETION_INDEXES: Dict[str, CompletionIndex] = {}
+
+def completion_index(name: str, values: List[str]) -> CompletionIndex:
+    """values は TTL キャッシュが返すリストそのもの。同じオブジェクトの間は索引を使い回す。"""
+    idx = _COMPLETION_INDEXES.get(name)
+    if idx is None or idx.source is not values:
+        idx = _COMPLETION_INDEXES[name] = CompletionIndex(values)
+    return idx
+
+LABEL_CACHE = AsyncTTLCache("labels", ttl_sec=LABEL_CACHE_TTL_SEC, stale_sec=24 * 3600)
 def _label_cache_key() -> str:
     return f"{GH_OWNER}/{GH_REPO}"
 
-async def get_repo_labels_cached() -> List[str]:
-    key = _label_cache_key()
-    if key in _LABEL_CACHE:
-        return _LABEL_CACHE[key]
-    def _fetch():
-        g = gh_client()
-        repo = g.get_repo(f"{GH_OWNER}/{GH_REPO}")
-        return [l.name for l in repo.get_labels()]
-    labels = await asyncio.to_thread(_fetch)
+async def _fetch_repo_labels() -> List[str]:
+    data = await gh_get_paginated(_gh_path(f"/repos/{_repo_full_name()}/labels", {"per_page": 100}))
+    labels = [l["name"] for l in data]
     labels.sort(key=str.lower)
-    _LABEL_CACHE[key] = labels
     return labels
 
+async def get_repo_labels_cached() -> List[str]:
+    return await LABEL_CACHE.get(_label_cache_key(), _fetch_repo_labels)
+
 LABEL_SHORTCUTS = {
     "todo": "status:todo",
     "doing": "status:in_progress",
@@ -663,8 +2117,8 @@ async def autocomplete_labels(interaction: discord.Interaction, current: str):
     parts = [p for p in base.split(" ") if p]
     prefix = parts[-1] if parts else ""
     labels = await get_repo_labels_cached()
-    cand = [l for l in labels if prefix.lower() in l.lower()]
     short_cand = [k for k in LABEL_SHORTCUTS.keys() if prefix.lower() in k.lower()]
+    cand = completion_index("labels", labels).search(prefix, 25 - len(short_cand))
     suggestions = (short_cand + cand)[:25]
 
     def replace_last(s: str) -> str:
@@ -675,38 +2129,76 @@ async def autocomplete_labels(interaction: discord.Interaction, current: str):
     return [app_commands.Choice(name=s, value=replace_last(s)) for s in suggestions]
 
 # === 協力者補完 ===
-_COLLAB_CACHE: Dict[str, List[str]] = {}
+# 期限切れ後も 30 日までは手元の候補を返しつつ裏で取り直す
+COLLAB_CACHE = AsyncTTLCache("collaborators", ttl_sec=COLLAB_REFRESH_SEC, stale_sec=30 * 24 * 3600)
 def _collab_cache_key() -> str:
     return f"{GH_OWNER}/{GH_REPO}"
 
+async def collaborators_load() -> Tuple[List[str], int]:
+    """保存済みの候補と最終取得時刻（未取得なら 0）。"""
+    async with db_read() as db:
+        cur = await db.execute("SELECT login, refreshed_at FROM collaborator WHERE repo=?", (_repo_full_name(),))
+        rows = await cur.fetchall()
+    logins = sorted((r[0] for r in rows), key=str.lower)
+    return logins, max((int(r[1]) for r in rows), default=0)
+
+async def collaborators_save(logins: List[str], refreshed_at: int):
+    async with db_write() as db:
+        await db.execute("DELETE FROM collaborator WHERE repo=?", (_repo_full_name(),))
+        await db.executemany(
+            "INSERT INTO collaborator (repo, login, refreshed_at) VALUES (?, ?, ?)",
+            [(_repo_full_name(), l, int(refreshed_at)) for l in logins]
+        )
+
+async def refresh_collaborators() -> List[str]:
+    """
+    push 権限の協力者 + 直近 COLLAB_ISSUE_SCAN 件の Issue 作成者（それ以上は遡らない）。
+    片方の取得に失敗した場合は保存済みの候補も残す。両方失敗したら例外を送出する（保存済みの候補は消さない）。
+    """
+    colls: List[str] = []
+    errors: List[Exception] = []
+    try:
+        data = await gh_get_paginated(_gh_path(f"/repos/{_repo_full_name()}/collaborators", {"permission": "push", "per_page": 100}))
+        colls.extend(u["login"] for u in data)
+    except Exception as e:
+        errors.append(e)
+    try:
+        url = _gh_path(f"/repos/{_repo_full_name()}/issues", {"state": "all", "sort": "created", "direction": "desc", "per_page": 100})
+        issues = await gh_get_paginated(url, COLLAB_ISSUE_SCAN)
+        colls.extend((i.get("user") or {}).get("login") or "" for i in issues)
+    except Exception as e:
+        errors.append(e)
+    if len(errors) == 2:
+        raise errors[0]
+    stored, _ = await collaborators_load()
+    if errors:
+        colls.extend(stored)
+    logins = [c for c in set(colls) if c]
+    logins.sort(key=str.lower)
+    if not logins and stored:
+        # 空の結果で保存済みの候補を上書きしない
+        return stored
+    await collaborators_save(logins, int(time.time()))
+    return logins
+
 async def get_repo_collaborators_cached() -> List[str]:
     key = _collab_cache_key()
-    if key in _COLLAB_CACHE:
-        return _COLLAB_CACHE[key]
-    def _fetch():
-        g = gh_client()
-        repo = g.get_repo(f"{GH_OWNER}/{GH_REPO}")
-        try:
-            colls = [u.login for u in repo.get_collaborators(permission="push")]
-        except Exception:
-            colls = []
-        try:
-            issues = list(repo.get_issues(state="all"))[:200]
-            colls.extend({(i.user.login if i.user else "") for i in issues})
-        except Exception:
-            pass
-        colls = [c for c in set(colls) if c]
-        colls.sort(key=str.lower)
-        return colls
-    logins = await asyncio.to_thread(_fetch)
-    _COLLAB_CACHE[key] = logins
-    return logins
+    if not COLLAB_CACHE.has(key):
+        # 再起動直後は DB の候補を、保存時刻からの経過時間付きで載せる（初回のみ取得を待つ）
+        logins, refreshed_at = await collaborators_load()
+        if refreshed_at:
+            COLLAB_CACHE.seed(key, logins, age_sec=time.time() - refreshed_at)
+    return await COLLAB_CACHE.get(key, refresh_collaborators)
 
 async def autocomplete_assignee(interaction: discord.Interaction, current: str):
-    cand = await get_repo_collaborators_cached()
-    cur = (current or "").lower()
-    filtered = [c for c in cand if cur in c.lower()][:25]
-    items = ["me"] + filtered
+    try:
+        cand = await get_repo_collaborators_cached()
+    except Exception as e:
+        # 保存済みの候補も無いまま取得に失敗した場合は 'me' だけ出す
+        print("collaborators fetch error:", e)
+        cand = []
+    filtered = completion_index("collaborators", cand).search(current, 24)
+    items = ["me"] + [c for c in filtered if c.lower() != "me"]
     return [app_commands.Choice(name=x, value=x) for x in items[:25]]
 
 async def autocomplete_group_name(interaction: discord.Interaction, current: str):
@@ -769,7 +2261,7 @@ class IssueCreateModal(discord.ui.Modal, title="Issueを作成"):
 
         # 'me' を GitHub ログインに解決
         if assignee and assignee.lower() == "me":
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with db_read() as db:
                 cur = await db.execute(
                     "SELECT github_login FROM user_link WHERE discord_user_id=?",
                     (interaction.user.id,)
@@ -803,7 +2295,8 @@ class IssueCreateModal(discord.ui.Modal, title="Issueを作成"):
                 assignee=assignee,
                 labels_csv=labels_csv,
                 due=due,
-                template_key=template_key
+                template_key=template_key,
+                client=interaction.client,
             )
             await interaction.followup.send(f"作成: [#{issue.number}] {issue.html_url}", ephemeral=True)
         except Exception as e:
@@ -823,7 +2316,7 @@ class GroupAddModal(discord.ui.Modal, title="グループを追加"):
         ch = interaction.channel
         bundle = await get_bundle(ch.id)
         if not bundle:
-            content = await build_bundle_content(ch.id)
+            content = (await build_bundle_pages(ch.id))[0]
             msg = await ch.send(content=content)
             try: await msg.edit(suppress=True)
             except TypeError:
@@ -896,12 +2389,11 @@ class GroupRenameModal(discord.ui.Modal, title="グループ名を変更"):
 
         import sqlite3
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with db_write() as db:
                 await db.execute(
                     "UPDATE bundle_group SET group_name=? WHERE channel_id=? AND group_name=?",
                     (new_name, self.channel_id, self.group_name)
                 )
-                await db.commit()
         except sqlite3.IntegrityError:
             await interaction.followup.send("一意制約エラー。別名を指定してください。", ephemeral=True); return
 
@@ -1013,10 +2505,13 @@ class GroupsManageView(discord.ui.View):
         if not bundle:
             await interaction.response.send_message("バンドル未作成。/task_bind_bundle を先に実行。", ephemeral=True); return
         _, msg_id, _, pin, sup = bundle
-        await refresh_bundle_message(interaction.client, self.channel_id, msg_id, pin, sup)
+        # 同期と再描画は 3 秒を超えうるので先に応答を保留する
+        await interaction.response.defer(ephemeral=True)
+        snap = await get_board_snapshot(force=True)
+        await refresh_bundle_message(interaction.client, self.channel_id, msg_id, pin, sup, snapshot=snap, force=True)
         if hasattr(interaction.client, "_bundle_last_refresh"):
             interaction.client._bundle_last_refresh[self.channel_id] = 0
-        await interaction.response.send_message("更新しました。", ephemeral=True)
+        await interaction.followup.send("更新しました。", ephemeral=True)
 
     @discord.ui.button(label="PIN切替", style=discord.ButtonStyle.secondary)
     async def btn_toggle_pin(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -1080,7 +2575,11 @@ class Bot(discord.Client):
         super().__init__(intents=discord.Intents.default())
         self.tree = app_commands.CommandTree(self)
         self._bundle_last_refresh: Dict[int, int] = {}  # channel_id -> epoch
+        self._bundle_dirty: set = set()  # Webhook/変更操作で変更を受けたチャンネル（次ティックで再描画）
+        self._dirty_kick: Optional[asyncio.Task] = None
         self._task_list_last_message: Dict[int, int] = {}
+        self._webhook_runner: Optional[web.AppRunner] = None
+        self._scheduler: Optional[BundleRefreshScheduler] = None  # setup_hook で生成
 
     # --- コマンド定義 ---
     def define_link_github(self):
@@ -1089,18 +2588,16 @@ class Bot(discord.Client):
         async def link_github_cmd(interaction: discord.Interaction, login: str):
             await interaction.response.defer(ephemeral=True)
             try:
-                g = gh_client()
-                g.get_user(login).id
+                await gh_request_json("GET", f"/users/{urllib.parse.quote(login)}")
             except Exception:
                 await interaction.followup.send("GitHubユーザーが見つかりません。スペルを確認してください。", ephemeral=True)
                 return
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with db_write() as db:
                 await db.execute(
                     "INSERT INTO user_link (discord_user_id, github_login) VALUES (?, ?) "
                     "ON CONFLICT(discord_user_id) DO UPDATE SET github_login=excluded.github_login",
                     (interaction.user.id, login)
                 )
-                await db.commit()
             await interaction.followup.send(f"Linked: {login}", ephemeral=True)
 
     def define_task_add(self):
@@ -1130,7 +2627,7 @@ class Bot(discord.Client):
         ):
             await interaction.response.defer()
             if assignee and assignee.lower() == "me":
-                async with aiosqlite.connect(DB_PATH) as db:
+                async with db_read() as db:
                     cur = await db.execute("SELECT github_login FROM user_link WHERE discord_user_id=?", (interaction.user.id,))
                     row = await cur.fetchone()
                     if not row:
@@ -1139,7 +2636,7 @@ class Bot(discord.Client):
                     assignee = row[0]
             templ_val = template.value if isinstance(template, app_commands.Choice) else None
             try:
-                issue = await gh_create_issue_with_template(title, body, assignee, labels, due, templ_val)
+                issue = await gh_create_issue_with_template(title, body, assignee, labels, due, templ_val, client=self)
                 await interaction.followup.send(f"作成: [#{issue.number}] {issue.html_url}")
             except ValueError as ve:
                 await interaction.followup.send(f"エラー: {ve}", ephemeral=True)
@@ -1160,23 +2657,22 @@ class Bot(discord.Client):
             note = (reason or "").strip()
             user_display = getattr(interaction.user, "display_name", str(interaction.user))
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                labels = list(issue.labels)
                 if not any(l.lower() == "status:blocked" for l in labels):
-                    return ("not_blocked", issue.html_url)
-                updated = remove_label(labels, "status:blocked")
-                if not any(l.lower().startswith("status:") for l in updated):
-                    updated.append("status:todo")
-                issue.edit(labels=updated)
+                    return IssueMutation(("not_blocked", issue.html_url))
                 comment_lines = [f"[unblock] Discordからブロック解除 (by {user_display})"]
                 if note:
                     comment_lines.append("")
                     comment_lines.append(note)
-                issue.create_comment("\n".join(comment_lines))
-                return ("unblocked", issue.html_url)
+                comment = "\n".join(comment_lines)
+                if any(l.lower().startswith("status:") for l in remove_label(labels, "status:blocked")):
+                    return IssueMutation(("unblocked", issue.html_url), remove_labels=("status:blocked",), comment=comment)
+                # 他に状態ラベルが無ければ status:todo へ付け替える（付け替えで status:blocked も外れる）
+                return IssueMutation(("unblocked", issue.html_url), status="status:todo", comment=comment)
 
             try:
-                state, url = await run_issue_action(number, worker)
+                state, url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1195,15 +2691,12 @@ class Bot(discord.Client):
         async def task_reopen_cmd(interaction: discord.Interaction, number: int):
             await interaction.response.defer(ephemeral=True)
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
-                new_labels = replace_status_label(labels, "status:todo")
+            def plan(issue: IssueSnapshot) -> IssueMutation:
                 already_open = issue.state == "open"
-                issue.edit(state="open", labels=new_labels)
-                return (already_open, issue.html_url)
+                return IssueMutation((already_open, issue.html_url), status="status:todo", state="open")
 
             try:
-                was_open, url = await run_issue_action(number, worker)
+                was_open, url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1232,17 +2725,14 @@ class Bot(discord.Client):
                 return
             login = resolved or raw_user
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
-                new_labels = replace_status_label(labels, "status:in_progress")
-                assignees = [a.login for a in issue.assignees if a]
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                assignees = list(issue.assignees)
                 if login not in assignees:
                     assignees.append(login)
-                issue.edit(labels=new_labels, assignees=assignees)
-                return (issue.html_url, assignees)
+                return IssueMutation((issue.html_url, assignees), status="status:in_progress", add_assignees=(login,))
 
             try:
-                url, assignees = await run_issue_action(number, worker)
+                url, assignees = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1263,13 +2753,12 @@ class Bot(discord.Client):
             await interaction.response.defer(ephemeral=True)
             user_display = getattr(interaction.user, "display_name", str(interaction.user))
 
-            def worker(issue: GH_Issue):
+            def plan(issue: IssueSnapshot) -> IssueMutation:
                 comment_lines = [body, "", "---", f"Discord: {user_display}"]
-                issue.create_comment("\n".join(comment_lines))
-                return issue.html_url
+                return IssueMutation(issue.html_url, comment="\n".join(comment_lines))
 
             try:
-                url = await run_issue_action(number, worker)
+                url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1298,13 +2787,12 @@ class Bot(discord.Client):
                     query_parts.append(kw)
             query = " ".join(query_parts)
 
-            def worker():
-                g = gh_client()
-                result = g.search_issues(query, sort="updated", order="desc")
-                return list(result[:10]), result.totalCount if hasattr(result, 'totalCount') else None
-
             try:
-                issues, total = await asyncio.to_thread(worker)
+                result = await gh_request_json(
+                    "GET", _gh_path("/search/issues", {"q": query, "sort": "updated", "order": "desc", "per_page": 10})
+                )
+                issues = [_mirror_issue_from_json(x) for x in result.get("items") or []]
+                total = result.get("total_count")
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1331,12 +2819,8 @@ class Bot(discord.Client):
         async def task_status_cmd(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
 
-            def worker():
-                repo = gh_client().get_repo(f"{GH_OWNER}/{GH_REPO}")
-                return list(repo.get_issues(state="open")[:200])  # ※ここは次項参照
-
             try:
-                issues = await asyncio.to_thread(worker)
+                issues = (await get_board_snapshot()).select([], include_closed=False)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1393,22 +2877,16 @@ class Bot(discord.Client):
             memo = (note or "").strip()
             user_display = getattr(interaction.user, "display_name", str(interaction.user))
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
-                new_labels = replace_status_label(labels, "status:in_progress")
-                assignees = [a.login for a in issue.assignees if a]
-                if login not in assignees:
-                    assignees.append(login)
-                issue.edit(labels=new_labels, assignees=assignees)
-                comment_lines = [f"[claim] {login} が担当を宣言 (by {user_display})"]
-                if memo:
-                    comment_lines.append("")
-                    comment_lines.append(memo)
-                issue.create_comment("\n".join(comment_lines))
-                return issue.html_url
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                return IssueMutation(
+                    issue.html_url,
+                    status="status:in_progress",
+                    add_assignees=(login,),
+                    comment=claim_comment(login, user_display, memo),
+                )
 
             try:
-                url = await run_issue_action(number, worker)
+                url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1431,25 +2909,16 @@ class Bot(discord.Client):
             memo = (note or "").strip()
             user_display = getattr(interaction.user, "display_name", str(interaction.user))
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
-                new_labels = replace_status_label(labels, "status:done")
-                kwargs = {"labels": new_labels}
-                if close:
-                    kwargs["state"] = "closed"
-                issue.edit(**kwargs)
-                comment_lines = [f"[done] Discordから完了処理 (by {user_display})"]
-                if memo:
-                    comment_lines.append("")
-                    comment_lines.append(memo)
-                if close:
-                    comment_lines.append("")
-                    comment_lines.append("IssueをCloseしました。")
-                issue.create_comment("\n".join(comment_lines))
-                return issue.html_url
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                return IssueMutation(
+                    issue.html_url,
+                    status="status:done",
+                    state="closed" if close else None,
+                    comment=done_comment(user_display, memo, close),
+                )
 
             try:
-                url = await run_issue_action(number, worker)
+                url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1460,6 +2929,136 @@ class Bot(discord.Client):
             action = "完了＋Close" if close else "完了"
             await interaction.followup.send(f"{action}にしました: [#{number}] {url}", ephemeral=True)
 
+    # ===== 一括操作 =====
+    def define_task_done_bulk(self):
+        @self.tree.command(name="task_done_bulk", description="複数のIssueをまとめて完了扱いにします（例: 12,15,20-24）。")
+        @app_commands.describe(numbers="Issue番号（カンマ区切り・範囲指定可。例: 12,15,20-24）", close="IssueをCloseするか", note="補足コメント（任意）")
+        async def task_done_bulk_cmd(
+            interaction: discord.Interaction,
+            numbers: str,
+            close: bool = True,
+            note: Optional[str] = None,
+        ):
+            try:
+                targets = parse_issue_numbers(numbers)
+            except ValueError as e:
+                await interaction.response.send_message(f"番号の指定が不正です: {e}", ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True)
+            memo = (note or "").strip()
+            user_display = getattr(interaction.user, "display_name", str(interaction.user))
+
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                labels = list(issue.labels)
+                new_labels = replace_status_label(labels, "status:done")
+                need_close = close and issue.state != "closed"
+                if same_labels(labels, new_labels) and not need_close:
+                    return IssueMutation(("noop", issue.html_url))
+                return IssueMutation(
+                    ("changed", issue.html_url),
+                    status="status:done",
+                    state="closed" if need_close else None,
+                    comment=done_comment(user_display, memo, need_close),
+                )
+
+            results = await run_bulk_issue_action(targets, plan, self)
+            action = "一括完了＋Close" if close else "一括完了"
+            await interaction.followup.send(format_bulk_summary(action, results), ephemeral=True)
+
+    def define_task_claim_bulk(self):
+        @self.tree.command(name="task_claim_bulk", description="複数のIssueをまとめて自分の担当にし、進行中に変更します。")
+        @app_commands.describe(numbers="Issue番号（カンマ区切り・範囲指定可。例: 12,15,20-24）", note="補足コメント（任意）")
+        async def task_claim_bulk_cmd(interaction: discord.Interaction, numbers: str, note: Optional[str] = None):
+            login = await get_linked_login(interaction.user.id)
+            if not login:
+                await interaction.response.send_message("まず /link_github でGitHubアカウントを紐付けてください。", ephemeral=True)
+                return
+            try:
+                targets = parse_issue_numbers(numbers)
+            except ValueError as e:
+                await interaction.response.send_message(f"番号の指定が不正です: {e}", ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True)
+            memo = (note or "").strip()
+            user_display = getattr(interaction.user, "display_name", str(interaction.user))
+
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                labels = list(issue.labels)
+                new_labels = replace_status_label(labels, "status:in_progress")
+                assignees = list(issue.assignees)
+                if same_labels(labels, new_labels) and login in assignees:
+                    return IssueMutation(("noop", issue.html_url))
+                return IssueMutation(
+                    ("changed", issue.html_url),
+                    status="status:in_progress",
+                    add_assignees=(login,),
+                    comment=claim_comment(login, user_display, memo),
+                )
+
+            results = await run_bulk_issue_action(targets, plan, self)
+            await interaction.followup.send(format_bulk_summary("一括担当宣言", results), ephemeral=True)
+
+    def define_task_label_bulk(self):
+        @self.tree.command(name="task_label_bulk", description="複数のIssueのラベルをまとめて追加/削除します。")
+        @app_commands.describe(
+            numbers="Issue番号（カンマ区切り・範囲指定可。例: 12,15,20-24）",
+            add="追加するラベル（スペース/カンマ区切り・ショートカット可）",
+            remove="外すラベル（スペース/カンマ区切り・ショートカット可）",
+        )
+        @app_commands.autocomplete(add=autocomplete_labels, remove=autocomplete_labels)
+        async def task_label_bulk_cmd(
+            interaction: discord.Interaction,
+            numbers: str,
+            add: Optional[str] = None,
+            remove: Optional[str] = None,
+        ):
+            add_labels = normalize_label_input(add or "")
+            remove_labels = normalize_label_input(remove or "")
+            if not add_labels and not remove_labels:
+                await interaction.response.send_message("add か remove を指定してください。", ephemeral=True)
+                return
+            bad = [l for l in add_labels if l.lower().startswith("status:") and l.lower() not in STATUS_LABELS]
+            if bad:
+                await interaction.response.send_message(
+                    f"不正な状態ラベル {', '.join(bad)}. 許可: {', '.join(sorted(STATUS_LABELS))}", ephemeral=True
+                )
+                return
+            try:
+                targets = parse_issue_numbers(numbers)
+            except ValueError as e:
+                await interaction.response.send_message(f"番号の指定が不正です: {e}", ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True)
+
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                labels = list(issue.labels)
+                new_labels = list(labels)
+                status = None
+                adds: List[str] = []
+                for name in add_labels:
+                    if name.lower().startswith("status:"):
+                        new_labels = replace_status_label(new_labels, name)
+                        status = name
+                    elif not any(l.lower() == name.lower() for l in new_labels):
+                        new_labels.append(name)
+                        adds.append(name)
+                for name in remove_labels:
+                    new_labels = remove_label(new_labels, name)
+                if same_labels(labels, new_labels):
+                    return IssueMutation(("noop", issue.html_url))
+                removes = tuple(
+                    l for l in labels
+                    if not any(l.lower() == n.lower() for n in new_labels)
+                    and not (status and l.lower().startswith("status:"))  # 付け替えで外れる
+                )
+                adds = [l for l in adds if any(l.lower() == n.lower() for n in new_labels)]
+                if status and not any(status.lower() == n.lower() for n in new_labels):
+                    status = None
+                return IssueMutation(("changed", issue.html_url), status=status, add_labels=tuple(adds), remove_labels=removes)
+
+            results = await run_bulk_issue_action(targets, plan, self)
+            await interaction.followup.send(format_bulk_summary("一括ラベル編集", results), ephemeral=True)
+
     def define_task_unclaim(self):
         @self.tree.command(name="task_unclaim", description="自分の担当を外し、status:todoに戻します。")
         @app_commands.describe(number="Issue番号", note="補足コメント（任意）")
@@ -1472,23 +3071,22 @@ class Bot(discord.Client):
             memo = (note or "").strip()
             user_display = getattr(interaction.user, "display_name", str(interaction.user))
 
-            def worker(issue: GH_Issue):
-                labels = [l.name for l in issue.labels]
-                new_labels = replace_status_label(labels, "status:todo")
-                original = [a.login for a in issue.assignees if a]
-                if login not in original:
-                    return ("not_assigned", issue.html_url)
-                assignees = [a for a in original if a != login]
-                issue.edit(labels=new_labels, assignees=assignees)
+            def plan(issue: IssueSnapshot) -> IssueMutation:
+                if login not in issue.assignees:
+                    return IssueMutation(("not_assigned", issue.html_url))
                 comment_lines = [f"[unclaim] {login} が担当を辞退 (by {user_display})"]
                 if memo:
                     comment_lines.append("")
                     comment_lines.append(memo)
-                issue.create_comment("\n".join(comment_lines))
-                return ("unclaimed", issue.html_url)
+                return IssueMutation(
+                    ("unclaimed", issue.html_url),
+                    status="status:todo",
+                    remove_assignees=(login,),
+                    comment="\n".join(comment_lines),
+                )
 
             try:
-                state, url = await run_issue_action(number, worker)
+                state, url = await run_issue_mutation(number, plan, self)
             except GithubException as e:
                 await interaction.followup.send(f"GitHubエラー: {e}", ephemeral=True)
                 return
@@ -1531,7 +3129,7 @@ class Bot(discord.Client):
             ch = interaction.channel
             iv = interval_quick.value if isinstance(interval_quick, app_commands.Choice) else (int(interval) if interval is not None else DEFAULT_INTERVAL_MIN)
 
-            content = await build_bundle_content(ch.id)
+            content = (await build_bundle_pages(ch.id))[0]
             msg = await ch.send(content=content)
             if suppress:
                 try: await msg.edit(suppress=True)
@@ -1563,7 +3161,7 @@ class Bot(discord.Client):
                 await interaction.followup.send("テキストチャンネルを指定してください。", ephemeral=True); return
             bundle = await get_bundle(target_ch.id)
             if not bundle:
-                content = await build_bundle_content(target_ch.id)
+                content = (await build_bundle_pages(target_ch.id))[0]
                 msg = await target_ch.send(content=content)
                 try: await msg.edit(suppress=True)
                 except TypeError:
@@ -1681,9 +3279,8 @@ class Bot(discord.Client):
                     filters = normalize_label_input(label_filters)
                     await upsert_bundle_group(target_ch.id, name, filters)
                 if new_name:
-                    async with aiosqlite.connect(DB_PATH) as db:
+                    async with db_write() as db:
                         await db.execute("UPDATE bundle_group SET group_name=? WHERE channel_id=? AND group_name=?", (new_name, target_ch.id, name))
-                        await db.commit()
             self._bundle_last_refresh[target_ch.id] = 0
             await interaction.followup.send("編集完了。", ephemeral=True)
 
@@ -1692,7 +3289,7 @@ class Bot(discord.Client):
         channel: Optional[discord.abc.GuildChannel],
         status: Optional[app_commands.Choice[str]],
         assignee: Optional[str],
-    ) -> List[GH_Issue]:
+    ) -> List[IssueSnapshot]:
         base_channel: Optional[discord.TextChannel]
         if isinstance(channel, discord.TextChannel):
             base_channel = channel
@@ -1703,40 +3300,21 @@ class Bot(discord.Client):
 
         groups = await list_bundle_groups(base_channel.id) if base_channel else []
         filters_default = groups[0][1] if groups else []
-        issues = await asyncio.to_thread(lambda: fetch_issues_sync(filters_default))
+        snap = await get_board_snapshot()
         status_raw = (status.value if isinstance(status, app_commands.Choice) else "todo,in_progress").lower()
         want = {x.strip() for x in status_raw.split(",") if x.strip() and x.strip() != "all"}
 
-        def pick(issue: GH_Issue) -> bool:
-            if assignee and (not issue.assignee or issue.assignee.login != assignee):
-                return False
-            if "done" in want and has_label(issue, "status:done"):
-                return True
-            if "in_progress" in want and issue.state == "open" and has_label(issue, "status:in_progress"):
-                return True
-            if "todo" in want and issue.state == "open" and has_label(issue, "status:todo"):
-                return True
-            return False
-
-        target = [issue for issue in issues if pick(issue)]
-
-        today = date.today()
+        bits = 0
+        if "done" in want:
+            bits |= snap.mask(filters_default + ["status:done"])
+        if "in_progress" in want:
+            bits |= snap.mask(filters_default + ["status:in_progress"], include_closed=False)
+        if "todo" in want:
+            bits |= snap.mask(filters_default + ["status:todo"], include_closed=False)
 
-        def rank(issue: GH_Issue) -> Tuple[int, datetime]:
-            due = parse_due(issue)
-            if due is None:
-                urgency = 3
-            elif due < today:
-                urgency = 0
-            elif due == today:
-                urgency = 1
-            elif (due - today).days <= 3:
-                urgency = 2
-            else:
-                urgency = 3
-            return (urgency, issue.updated_at)
+        target = [issue for issue in snap.from_mask(bits) if not assignee or issue.assignee == assignee]
 
-        target.sort(key=rank)
+        target.sort(key=lambda issue: (due_urgency(issue), issue.updated_at))
         return target
 
     async def _send_task_list_embed(
@@ -1854,7 +3432,7 @@ class Bot(discord.Client):
                 await interaction.followup.send("テキストチャンネルを指定してください。", ephemeral=True); return
             bundle = await get_bundle(target_ch.id)
             if not bundle:
-                content = await build_bundle_content(target_ch.id)
+                content = (await build_bundle_pages(target_ch.id))[0]
                 msg = await target_ch.send(content=content)
                 try: await msg.edit(suppress=True)
                 except TypeError:
@@ -1884,6 +3462,36 @@ class Bot(discord.Client):
             cmds = await self.tree.fetch_commands(guild=guild)
             await interaction.followup.send(f"再同期: {len(cmds)} -> {[c.name for c in cmds]}（diff={len(diff)}）", ephemeral=True)
 
+    def define_admin_metrics(self):
+        @self.tree.command(name="admin_metrics", description="（管理者）バンドル更新などの内部統計を表示します。")
+        async def admin_metrics_cmd(interaction: discord.Interaction):
+            if not interaction.user.guild_permissions.administrator:
+                await interaction.response.send_message("権限不足。", ephemeral=True)
+                return
+            parts = []
+            if self._scheduler:
+                parts.append("**Scheduler**")
+                parts.append(self._scheduler.summary())
+            st = BUNDLE_EDIT_STATS
+            parts.append("**Bundle edits**")
+            parts.append(
+                f"edited={st['edited']} footer_only={st['footer_only']} skipped={st['skipped']} "
+                f"sent={st['sent']} deleted={st['deleted']}"
+            )
+            parts.append("**GitHub lanes**")
+            parts.append(lane_summary())
+            parts.append("**GitHub rate limit**")
+            parts.append(RATE_BUDGET.summary())
+            parts.append("**Caches**")
+            parts.extend(c.summary() for c in TTL_CACHES)
+            rc = RENDER_CACHE_STATS
+            parts.append(f"render: hits={rc['hits']} misses={rc['misses']} rel_updates={rc['rel_updates']} size={len(_RENDER_CACHE)}")
+            mu = MUTATION_STATS
+            parts.append(f"mutations: cached={mu['cached']} fetched={mu['fetched']} requests={mu['requests']} conflict_retries={mu['conflict_retries']}")
+            sf = SINGLE_FLIGHT_STATS
+            parts.append(f"single-flight: leaders={sf['leaders']} shared={sf['shared']} inflight={len(_SINGLE_FLIGHT)}")
+            await interaction.response.send_message("\n".join(parts) or "統計なし。", ephemeral=True)
+
     # === セレクト＋ボタンUIを出すコマンド ===
     def define_task_groups_ui(self):
         @self.tree.command(name="task_groups_ui", description="対話UI（セレクト＋ボタン）でグループ管理を行います。")
@@ -1911,6 +3519,9 @@ class Bot(discord.Client):
             self.define_task_claim,
             self.define_task_done,
             self.define_task_unclaim,
+            self.define_task_done_bulk,
+            self.define_task_claim_bulk,
+            self.define_task_label_bulk,
             self.define_task_bind_bundle,
             self.define_task_group_add,
             self.define_task_group_add_modal,
@@ -1922,10 +3533,16 @@ class Bot(discord.Client):
             self.define_task_list,
             self.define_task_list_embed,
             self.define_admin_resync,
+            self.define_admin_metrics,
         ]
         for r in registrars:
             r()
 
+        # Webhook は起動直後から届きうるので、受け付ける前にテーブルを用意しておく
+        await db_init()
+        self._webhook_runner = await start_webhook_server(self)
+        self._scheduler = BundleRefreshScheduler(self, concurrency=REFRESH_CONCURRENCY, timeout_sec=REFRESH_TIMEOUT_SEC)
+
         FORCE_CLEAR = os.getenv("COMMANDS_FORCE_CLEAR", "").lower() in ("1", "true", "yes")
 
         if GUILD_ID:
@@ -1943,23 +3560,73 @@ class Bot(discord.Client):
             cmds = await self.tree.fetch_commands()
             print(f"[SYNC] global: diff={len(diff)} | cmds={len(cmds)} -> {[c.name for c in cmds]}")
 
+    async def close(self):
+        if self._webhook_runner:
+            await self._webhook_runner.cleanup()
+        await super().close()
+        await db_close()
+        await close_gh_session()
+
+    def mark_bundles_dirty(self, channels: set, *, now: bool = False):
+        """指定チャンネルのバンドルを再描画対象にする。now=True なら次ティックを待たずに回す。"""
+        if not channels:
+            return
+        self._bundle_dirty.update(channels)
+        if now and self.periodic_refresh.is_running() and not (self._dirty_kick and not self._dirty_kick.done()):
+            self._dirty_kick = asyncio.create_task(self._kick_dirty_refresh())
+
+    async def _kick_dirty_refresh(self):
+        # 一括操作などで続けて呼ばれても1回の前倒しティックにまとめる
+        await asyncio.sleep(DIRTY_REFRESH_DELAY_SEC)
+        await self.periodic_refresh.coro(self)
+
     # ===== 定期更新: バンドル単位（1分刻み） =====
     @tasks.loop(minutes=1)
     async def periodic_refresh(self):
-        import time
+        GH_LANE.set("background")
         try:
             now = int(time.time())
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with db_read() as db:
                 cur = await db.execute("SELECT channel_id, message_id, interval_min, pin, suppress FROM bundle")
                 rows = await cur.fetchall()
             if not rows:
                 return
+            jobs = []
+            need_sync = False
+            # 残りレートが減るほど間隔を延ばし、予約分に達したら reset まで同期を伴う更新は止める
+            resource = _sync_resource()
+            factor = RATE_BUDGET.interval_factor(resource)
+            paused = not RATE_BUDGET.background_allowed(resource)
             for ch_id, msg_id, iv, pin, sup in rows:
+                # 前回分がまだ実行中なら重ねない（dirty もそのまま次ティックへ持ち越す）
+                if self._scheduler.skip_if_inflight(int(ch_id)):
+                    continue
                 last = self._bundle_last_refresh.get(int(ch_id), 0)
-                if last and (now - last) < int(iv) * 60:
+                iv_sec = int(iv) * 60
+                if self._webhook_runner:
+                    iv_sec = max(iv_sec, WEBHOOK_RECONCILE_MIN * 60)
+                iv_sec *= factor
+                if int(ch_id) in self._bundle_dirty:
+                    self._bundle_dirty.discard(int(ch_id))
+                    due_at = now
+                elif last and (now - last) < iv_sec:
+                    continue
+                elif paused:
+                    RATE_BUDGET.stats["background_skips"] += 1
                     continue
-                await refresh_bundle_message(self, int(ch_id), int(msg_id), bool(pin), bool(sup))
-                self._bundle_last_refresh[int(ch_id)] = now
+                else:
+                    need_sync = True
+                    due_at = last + iv_sec if last else now
+                jobs.append((float(due_at), int(ch_id), int(msg_id), bool(pin), bool(sup)))
+            if not jobs:
+                return
+            # このティックの全バンドルで共有（GitHub への問い合わせはティックあたり一定）
+            # Webhook 由来の再描画だけならミラーは反映済みなので同期しない
+            snap = await get_board_snapshot(force=need_sync)
+            for _, ch_id, _, _, _ in jobs:
+                self._bundle_last_refresh[ch_id] = now
+            # 更新自体は待たない（遅いチャンネルが他を巻き込まず、ティックも溢れない）
+            self._scheduler.dispatch(jobs, snap)
         except Exception as e:
             print("periodic_refresh error:", e)
 
@@ -1967,12 +3634,100 @@ class Bot(discord.Client):
     async def before_periodic_refresh(self):
         await self.wait_until_ready()
 
+# ===== バンドル更新スケジューラ =====
+class BundleRefreshScheduler:
+    """
+    periodic_refresh の各ティックから期限到来分を受け取り、期限の古い順に並行更新する。
+    - 同時実行数は REFRESH_CONCURRENCY まで（セマフォ待ちも期限順）
+    - 1チャンネルあたり REFRESH_TIMEOUT_SEC で打ち切り
+    - 同じチャンネルの更新が実行中なら、そのティックの分は見送る
+    """
+    def __init__(self, client: discord.Client, *, concurrency: int, timeout_sec: int):
+        self.client = client
+        self.timeout_sec = timeout_sec
+        self._sem = asyncio.Semaphore(max(1, concurrency))
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self.stats: Dict[str, float] = {
+            "dispatched": 0, "completed": 0, "timeouts": 0, "errors": 0, "skipped_inflight": 0,
+            "lag_last_sec": 0.0, "lag_max_sec": 0.0, "lag_total_sec": 0.0,
+        }
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def skip_if_inflight(self, ch_id: int) -> bool:
+        if ch_id in self._inflight:
+            self.stats["skipped_inflight"] += 1
+            return True
+        return False
+
+    def dispatch(self, jobs: List[Tuple[float, int, int, bool, bool]], snapshot: Optional[BoardSnapshot]):
+        """jobs: (due_at, channel_id, message_id, pin, suppress)。待たずに戻る。"""
+        heap = list(jobs)
+        heapq.heapify(heap)
+        while heap:
+            due_at, ch_id, msg_id, pin, sup = heapq.heappop(heap)
+            if self.skip_if_inflight(ch_id):
+                continue
+            self.stats["dispatched"] += 1
+            self._inflight[ch_id] = asyncio.create_task(self._run(due_at, ch_id, msg_id, pin, sup, snapshot))
+
+    async def _run(self, due_at: float, ch_id: int, msg_id: int, pin: bool, sup: bool, snapshot: Optional[BoardSnapshot]):
+        try:
+            async with self._sem:
+                lag = max(0.0, time.time() - due_at)
+                self.stats["lag_last_sec"] = lag
+                self.stats["lag_max_sec"] = max(self.stats["lag_max_sec"], lag)
+                self.stats["lag_total_sec"] += lag
+                await asyncio.wait_for(
+                    refresh_bundle_message(self.client, ch_id, msg_id, pin, sup, snapshot=snapshot),
+                    timeout=self.timeout_sec,
+                )
+                self.stats["completed"] += 1
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            print(f"bundle refresh timeout: channel={ch_id}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"bundle refresh error: channel={ch_id}:", e)
+        finally:
+            self._inflight.pop(ch_id, None)
+
+    def summary(self) -> str:
+        st = self.stats
+        started = st["completed"] + st["timeouts"] + st["errors"]
+        avg = st["lag_total_sec"] / started if started else 0.0
+        return (
+            f"dispatched={int(st['dispatched'])} completed={int(st['completed'])} timeouts={int(st['timeouts'])} "
+            f"errors={int(st['errors'])} skipped_inflight={int(st['skipped_inflight'])} inflight={self.inflight}\n"
+            f"lag: last={st['lag_last_sec']:.1f}s avg={avg:.1f}s max={st['lag_max_sec']:.1f}s"
+        )
+
 # ===== バンドル更新 =====
-async def refresh_bundle_message(client: discord.Client, channel_id: int, message_id: int, pin: bool, suppress: bool):
-    channel = client.get_channel(channel_id)
-    if not isinstance(channel, discord.TextChannel):
-        return
-    content = await build_bundle_content(channel_id)
+# バンドル編集の省略状況（/admin_metrics で表示。メッセージ単位）
+BUNDLE_EDIT_STATS: Dict[str, int] = {"edited": 0, "footer_only": 0, "skipped": 0, "sent": 0, "deleted": 0}
+
+async def _send_bundle_page(channel: discord.TextChannel, content: str, suppress: bool) -> discord.Message:
+    msg = await channel.send(content=content)
+    if suppress:
+        try:
+            await msg.edit(suppress=True)
+        except TypeError:
+            try:
+                await msg.suppress_embeds(True)  # type: ignore[attr-defined]
+            except Exception:
+                pass
+    return msg
+
+async def _delete_bundle_page(channel: discord.TextChannel, message_id: int):
+    try:
+        await channel.get_partial_message(message_id).delete()
+    except (discord.NotFound, discord.Forbidden):
+        pass
+
+async def _refresh_main_message(channel: discord.TextChannel, message_id: int, content: str, pin: bool, suppress: bool) -> int:
+    """先頭メッセージ（ピン留め対象）を更新。消えていれば作り直して新しいIDを返す。"""
     try:
         msg = await channel.fetch_message(message_id)
         try:
@@ -1994,33 +3749,182 @@ async def refresh_bundle_message(client: discord.Client, channel_id: int, messag
                 await msg.unpin()
             except discord.Forbidden:
                 pass
+        return message_id
     except discord.NotFound:
         # 消えていたら再作成
-        new_msg = await channel.send(content=content)
-        if suppress:
-            try:
-                await new_msg.edit(suppress=True)
-            except TypeError:
-                try:
-                    await new_msg.suppress_embeds(True)  # type: ignore[attr-defined]
-                except Exception:
-                    pass
+        new_msg = await _send_bundle_page(channel, content, suppress)
         if pin and not new_msg.pinned:
             try:
                 await new_msg.pin()
             except discord.Forbidden:
                 pass
-        await upsert_bundle(channel_id, new_msg.id, DEFAULT_INTERVAL_MIN, pin, suppress)
+        await upsert_bundle(channel.id, new_msg.id, DEFAULT_INTERVAL_MIN, pin, suppress)
+        return new_msg.id
+
+async def refresh_bundle_message(
+    client: discord.Client,
+    channel_id: int,
+    message_id: int,
+    pin: bool,
+    suppress: bool,
+    snapshot: Optional[BoardSnapshot] = None,
+    force: bool = False,
+):
+    """
+    バンドルを構成する各メッセージを更新する。内容が変わったメッセージだけを編集し、
+    ページが増えれば末尾に送信、減れば余りを削除する。
+    """
+    channel = client.get_channel(channel_id)
+    if not isinstance(channel, discord.TextChannel):
+        return
+    pages = await build_bundle_pages(channel_id, snapshot)
+    now = int(time.time())
+
+    stored = await list_bundle_messages(channel_id)
+    if 0 in stored and stored[0][0] != message_id:
+        # 先頭メッセージが差し替わった（再バインド等）→ 以前の続きは並びが崩れるので作り直す
+        for seq, (mid, _, _) in stored.items():
+            if seq > 0:
+                await _delete_bundle_page(channel, mid)
+                BUNDLE_EDIT_STATS["deleted"] += 1
+        stored = {}
+    stored.setdefault(0, (message_id, None, 0))
+
+    resend_rest = False
+    for seq, content in enumerate(pages):
+        digest = bundle_content_hash(content)
+        mid, prev_digest, edited_at = stored.get(seq, (None, None, 0))
+        if mid and resend_rest:
+            await _delete_bundle_page(channel, mid)
+            BUNDLE_EDIT_STATS["deleted"] += 1
+            mid = None
+        elif mid and not force and digest == prev_digest:
+            # 内容が同じなら fetch/edit とも省略。時刻表記だけは FOOTER_REFRESH_MIN ごとに更新
+            if (now - edited_at) < FOOTER_REFRESH_MIN * 60:
+                BUNDLE_EDIT_STATS["skipped"] += 1
+                continue
+            BUNDLE_EDIT_STATS["footer_only"] += 1
+        elif mid:
+            BUNDLE_EDIT_STATS["edited"] += 1
+
+        if seq == 0:
+            mid = await _refresh_main_message(channel, message_id, content, pin, suppress)
+            # 先頭を作り直した場合、続きはその下に並べ直す
+            resend_rest = mid != message_id
+        else:
+            if mid:
+                try:
+                    await channel.get_partial_message(mid).edit(content=content)
+                except discord.NotFound:
+                    mid = None
+            if not mid:
+                mid = (await _send_bundle_page(channel, content, suppress)).id
+                BUNDLE_EDIT_STATS["sent"] += 1
+        await save_bundle_message(channel_id, seq, mid, digest, now)
+
+    for seq, (mid, _, _) in sorted(stored.items()):
+        if seq >= len(pages):
+            await _delete_bundle_page(channel, mid)
+            await delete_bundle_message(channel_id, seq)
+            BUNDLE_EDIT_STATS["deleted"] += 1
+
+# ========= Webhook（GitHub → Bot への変更通知） =========
+# 受けた変更をミラーへ直接反映し、該当グループを持つバンドルだけを次ティックで再描画する。
+# 定期更新は取りこぼし対策の突き合わせ（WEBHOOK_RECONCILE_MIN）に退く。
+def verify_webhook_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+def _group_matches(filters: List[str], labels: Tuple[str, ...]) -> bool:
+    """BoardSnapshot.mask と同じく大文字小文字を区別しない。"""
+    names = {l.lower() for l in labels}
+    return all(f.lower() in names for f in filters)
+
+async def channels_for_label_sets(label_sets: List[Tuple[str, ...]]) -> set:
+    """いずれかのラベル集合にマッチするグループを持つチャンネルIDの集合。"""
+    out = set()
+    for ch_id, filters in await list_all_bundle_groups():
+        if any(_group_matches(filters, labels) for labels in label_sets):
+            out.add(ch_id)
+    return out
+
+async def apply_webhook_event(event: str, payload: Dict) -> set:
+    """issues / issue_comment / label イベントをミラーに反映し、再描画が必要なチャンネルIDを返す。"""
+    repo = (payload.get("repository") or {}).get("full_name")
+    if repo and repo.lower() != _repo_full_name().lower():
+        return set()
+    action = payload.get("action")
+
+    if event in ("issues", "issue_comment") and payload.get("issue"):
+        new = _mirror_issue_from_json(payload["issue"])
+        if event == "issues" and action in ("deleted", "transferred"):
+            old = await mirror_get(new.number)
+            await mirror_delete(new.number)
+            patch_board_snapshot(removals=[new.number])
+            return await channels_for_label_sets([new.labels] + ([old.labels] if old else []))
+        return await write_through_issues([new])
+
+    if event == "label" and payload.get("label"):
+        LABEL_CACHE.expire(_label_cache_key())
+        name = payload["label"]["name"]
+        old_name = ((payload.get("changes") or {}).get("name") or {}).get("from")
+        if action == "edited" and old_name and old_name != name:
+            changed = await mirror_rename_label(old_name, name)
+        elif action == "deleted":
+            changed = await mirror_rename_label(name, None)
+        else:
+            return set()
+        patch_board_snapshot(upserts=changed)
+        # 旧名でフィルタしていたグループにも影響するので旧ラベル集合も含める
+        label_sets = [i.labels for i in changed] + [i.labels + (old_name or name,) for i in changed]
+        return await channels_for_label_sets(label_sets)
+
+    return set()
+
+async def _webhook_handler(request: web.Request) -> web.Response:
+    body = await request.read()
+    if not verify_webhook_signature(WEBHOOK_SECRET or "", body, request.headers.get("X-Hub-Signature-256")):
+        return web.Response(status=401, text="bad signature")
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return web.Response(text="pong")
+    try:
+        payload = json.loads(body)
+    except Exception:
+        return web.Response(status=400, text="bad payload")
+    try:
+        dirty = await apply_webhook_event(event, payload)
+    except Exception as e:
+        print("webhook error:", e)
+        return web.Response(status=500, text="error")
+    bot: "Bot" = request.app["bot"]
+    bot.mark_bundles_dirty(dirty)
+    return web.Response(text=f"ok ({len(dirty)} bundles)")
+
+async def start_webhook_server(bot: "Bot") -> Optional[web.AppRunner]:
+    if not WEBHOOK_SECRET:
+        return None
+    app = web.Application()
+    app["bot"] = bot
+    app.router.add_post(WEBHOOK_PATH, _webhook_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+    print(f"[WEBHOOK] listening on {WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}")
+    return runner
 
 # ========= エントリポイント =========
 client = Bot()
 
 @client.event
 async def on_ready():
-    await db_init()
-    # 予温（非同期でオートコンプリート体感を改善）
+    # 予温（非同期でオートコンプリート体感を改善）。裏方レーンで行う
+    token = GH_LANE.set("background")
     asyncio.create_task(get_repo_labels_cached())
     asyncio.create_task(get_repo_collaborators_cached())
+    GH_LANE.reset(token)
 
     app = await client.application_info()
     print(f"Logged in as {client.user} (app_id={app.id})")
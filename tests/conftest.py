@@ -0,0 +1,22 @@
+import os
+import sys
+
+# bot.py はリポジトリ直下の単一モジュール。import 時に環境変数を読むので先に埋めておく
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GITHUB_TOKEN", "test-token")
+os.environ.setdefault("GITHUB_OWNER", "owner")
+os.environ.setdefault("GITHUB_REPO", "repo")
+
+import pytest
+
+import bot
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """テストごとに空の SQLite を使う（終わったら共有接続を閉じる）。"""
+    import asyncio
+
+    monkeypatch.setattr(bot, "DB_PATH", str(tmp_path / "bot.db"))
+    yield bot.DB_PATH
+    asyncio.run(bot.db_close())
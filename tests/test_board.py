@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import bot
+
+
+def issue(number, labels, state="open"):
+    return bot.IssueSnapshot(
+        number=number,
+        title=f"t{number}",
+        state=state,
+        labels=tuple(labels),
+        assignees=(),
+        due=None,
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        html_url=f"https://github.com/owner/repo/issues/{number}",
+    )
+
+
+def test_group_match_ignores_case_like_the_snapshot():
+    snap = bot.BoardSnapshot([issue(1, ["Bug", "status:todo"])], taken_at=0.0)
+    assert [i.number for i in snap.select(["bug"])] == [1]
+    assert bot._group_matches(["bug"], ("Bug",))
+    assert bot._group_matches(["BUG", "Status:Todo"], ("bug", "status:todo"))
+    assert not bot._group_matches(["bug", "ui"], ("Bug",))
+
+
+def test_mask_intersects_filters_and_excludes_closed():
+    snap = bot.BoardSnapshot(
+        [
+            issue(1, ["type:bug", "status:todo"]),
+            issue(2, ["type:bug", "status:in_progress"]),
+            issue(3, ["type:bug", "status:done"], state="closed"),
+            issue(4, ["type:task", "status:todo"]),
+        ],
+        taken_at=0.0,
+    )
+    numbers = lambda bits: sorted(i.number for i in snap.from_mask(bits))
+    assert numbers(snap.mask(["type:bug"])) == [1, 2, 3]
+    assert numbers(snap.mask(["type:bug"], include_closed=False)) == [1, 2]
+    assert numbers(snap.mask(["TYPE:BUG", "status:todo"])) == [1]
+    assert snap.mask(["type:bug", "missing"]) == 0
+    assert numbers(snap.mask([])) == [1, 2, 3, 4]
+
+
+def test_mask_follows_upserts_and_removals():
+    snap = bot.BoardSnapshot([issue(1, ["type:bug"]), issue(2, ["type:bug"])], taken_at=0.0)
+    snap.upsert(issue(1, ["type:task"]))
+    snap.remove(2)
+    snap.upsert(issue(5, ["type:bug"]))
+    assert [i.number for i in snap.select(["type:bug"])] == [5]
+    assert [i.number for i in snap.select(["type:task"])] == [1]
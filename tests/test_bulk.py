@@ -0,0 +1,14 @@
+import pytest
+
+import bot
+
+
+def test_parse_issue_numbers_expands_ranges_and_dedupes():
+    assert bot.parse_issue_numbers("12,15,20-22") == [12, 15, 20, 21, 22]
+    assert bot.parse_issue_numbers("#3 #3, 5-3") == [3, 4, 5]
+
+
+@pytest.mark.parametrize("raw", ["", "a", "0", "1-1000"])
+def test_parse_issue_numbers_rejects_bad_input(raw):
+    with pytest.raises(ValueError):
+        bot.parse_issue_numbers(raw)
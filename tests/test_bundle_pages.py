@@ -0,0 +1,23 @@
+import bot
+
+
+def test_paginate_bundle_packs_sections_and_appends_footer():
+    pages = bot.paginate_bundle(["A\nx", "B\ny"], "\n\nfooter", limit=100)
+    assert pages == ["A\nx\n\nB\ny\n\nfooter"]
+
+
+def test_paginate_bundle_splits_long_sections_at_blocks():
+    blocks = [f"block{i} " + "x" * 30 for i in range(6)]
+    section = "見出し\n" + "\n\n".join(blocks)
+    pages = bot.paginate_bundle([section], "\nF", limit=100)
+    assert len(pages) > 1
+    assert all(len(p) <= 100 for p in pages)
+    assert pages[0].startswith("見出し")
+    assert pages[1].startswith("見出し (続き)")
+    assert pages[-1].endswith("\nF")
+    joined = "".join(pages)
+    assert all(b in joined for b in blocks)
+
+
+def test_paginate_bundle_empty_still_has_footer():
+    assert bot.paginate_bundle([], "F") == ["F"]
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+import bot
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_ttl_cache_serves_last_good_value_when_loader_fails():
+    cache = bot.AsyncTTLCache("test-stale", ttl_sec=60, stale_sec=0)
+
+    async def ok():
+        return ["a"]
+
+    async def boom():
+        raise RuntimeError("github down")
+
+    async def scenario():
+        assert await cache.get("k", ok) == ["a"]
+        cache.expire("k")
+        cache._data["k"] = (cache._data["k"][0] - 1, cache._data["k"][1])  # stale 窓も過ぎた状態
+        return await cache.get("k", boom)
+
+    assert run(scenario()) == ["a"]
+    assert cache.stats["errors"] == 1
+
+
+def test_ttl_cache_raises_without_a_previous_value():
+    cache = bot.AsyncTTLCache("test-empty", ttl_sec=60, stale_sec=0)
+
+    async def boom():
+        raise RuntimeError("github down")
+
+    with pytest.raises(RuntimeError):
+        run(cache.get("k", boom))
+    assert cache.stats["errors"] == 1
+    assert not cache.has("k")
+
+
+def test_collaborator_refresh_failure_keeps_stored_candidates(db_path, monkeypatch):
+    async def failing(url, limit=None):
+        raise RuntimeError("github down")
+
+    monkeypatch.setattr(bot, "gh_get_paginated", failing)
+    bot.COLLAB_CACHE.invalidate()
+
+    async def scenario():
+        await bot.db_init()
+        await bot.collaborators_save(["alice", "bob"], 1)  # 十分古い → 取り直しが走る
+        bot.COLLAB_CACHE.stats["errors"] = 0
+        served = await bot.get_repo_collaborators_cached()
+        stored = await bot.collaborators_load()
+        return served, stored
+
+    served, stored = run(scenario())
+    assert served == ["alice", "bob"]
+    assert stored == (["alice", "bob"], 1)
+    assert bot.COLLAB_CACHE.stats["errors"] == 1
+    bot.COLLAB_CACHE.invalidate()
+
+
+def test_stale_hit_refreshes_once_in_the_background():
+    cache = bot.AsyncTTLCache("test-swr", ttl_sec=60, stale_sec=600)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return [len(calls)]
+
+    async def scenario():
+        await cache.get("k", loader)
+        cache.expire("k")
+        served = [await cache.get("k", loader), await cache.get("k", loader)]
+        assert len(cache._refreshing) == 1  # 取り直しは 1 本だけ、参照も保持している
+        await asyncio.gather(*cache._refreshing.values())
+        return served, await cache.get("k", loader)
+
+    served, fresh = run(scenario())
+    assert served == [[1], [1]]
+    assert fresh == [2]
+    assert len(calls) == 2
+    assert not cache._refreshing
+
+
+def test_stale_refresh_waits_for_the_rate_budget(monkeypatch):
+    budget = bot.RateBudget(reserve=300)
+    budget.observe({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(2**31), "X-RateLimit-Resource": "core"})
+    monkeypatch.setattr(bot, "RATE_BUDGET", budget)
+    cache = bot.AsyncTTLCache("test-budget", ttl_sec=60, stale_sec=600)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return ["v"]
+
+    async def scenario():
+        cache.seed("k", ["old"])
+        cache.expire("k")
+        served = await cache.get("k", loader)
+        await asyncio.gather(*cache._refreshing.values())
+        return served
+
+    assert run(scenario()) == ["old"]
+    assert calls == []
+    assert budget.stats["background_skips"] == 1
@@ -0,0 +1,10 @@
+import bot
+
+
+def test_completion_index_ranks_prefix_then_substring_then_fuzzy():
+    idx = bot.CompletionIndex(["type:bug", "status:todo", "bugfix", "debug", "status:in_progress"])
+    assert idx.search("bug") == ["bugfix", "debug", "type:bug"]
+    assert idx.search("STATUS")[:2] == ["status:in_progress", "status:todo"]
+    assert idx.search("stauts:todo") == ["status:todo"]
+    assert idx.search("") == idx.values
+    assert idx.search("zzz") == []
@@ -0,0 +1,56 @@
+import asyncio
+
+import bot
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_reads_never_see_a_half_finished_write(db_path):
+    async def scenario():
+        await bot.db_init()
+        await bot.collaborators_save(["alice", "bob"], 100)
+        seen = []
+
+        async def reader():
+            for _ in range(50):
+                seen.append(len((await bot.collaborators_load())[0]))
+                await asyncio.sleep(0)
+
+        async def writer():
+            for i in range(20):
+                await bot.collaborators_save(["alice", "bob", f"u{i}"][: 2 + i % 2], 100 + i)
+
+        await asyncio.gather(reader(), writer())
+        return seen
+
+    seen = run(scenario())
+    assert 0 not in seen
+
+
+def test_missing_open_rows_are_removed_unless_recently_updated(db_path):
+    from datetime import datetime, timezone
+
+    def issue(number, state, day):
+        return bot.IssueSnapshot(
+            number=number,
+            title=f"t{number}",
+            state=state,
+            labels=(),
+            assignees=(),
+            due=None,
+            updated_at=datetime(2026, 1, day, tzinfo=timezone.utc),
+            html_url=f"https://github.com/owner/repo/issues/{number}",
+        )
+
+    async def scenario():
+        await bot.db_init()
+        await bot.mirror_upsert([issue(1, "open", 1), issue(2, "open", 1), issue(3, "closed", 1), issue(4, "open", 9)], {})
+        gone = await bot.mirror_delete_missing_open({1}, before=datetime(2026, 1, 5, tzinfo=timezone.utc))
+        left = [await bot.mirror_get(n) for n in (1, 2, 3, 4)]
+        return gone, [i.number for i in left if i]
+
+    gone, left = run(scenario())
+    assert gone == [2]  # 3 は closed、4 は一覧より新しいかもしれないので残す
+    assert left == [1, 3, 4]
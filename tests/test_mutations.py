@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+import bot
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def issue(number, labels, assignees=(), state="open"):
+    return bot.IssueSnapshot(
+        number=number,
+        title=f"t{number}",
+        state=state,
+        labels=tuple(labels),
+        assignees=tuple(assignees),
+        due=None,
+        updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        html_url=f"https://github.com/owner/repo/issues/{number}",
+    )
+
+
+class FakeIssueAPI:
+    """_mutation_request の代わりに、1つの Issue への差分を記録・適用する。"""
+
+    def __init__(self, labels, assignees=(), fail=None):
+        self.labels = list(labels)
+        self.assignees = list(assignees)
+        self.state = "open"
+        self.calls = []
+        self.fail = fail  # (verb, status): 最初の1回だけ失敗させる
+
+    def issue_json(self):
+        return {
+            "number": 1,
+            "title": "t1",
+            "state": self.state,
+            "labels": [{"name": l} for l in self.labels],
+            "assignees": [{"login": a} for a in self.assignees],
+            "body": "",
+            "updated_at": "2026-01-02T00:00:00Z",
+            "html_url": "https://github.com/owner/repo/issues/1",
+        }
+
+    async def __call__(self, verb, path, payload=None, missing_ok=False):
+        self.calls.append((verb, path.split("/issues/1", 1)[-1]))
+        if self.fail and self.fail[0] == verb:
+            status, self.fail = self.fail[1], None
+            raise bot.GithubException(status, {"message": "conflict"}, None)
+        if path.endswith("/labels") and verb == "POST":
+            self.labels += [n for n in payload["labels"] if n not in self.labels]
+            return [{"name": l} for l in self.labels]
+        if "/labels/" in path:
+            name = bot.urllib.parse.unquote(path.rsplit("/", 1)[1])
+            if name not in self.labels:
+                return None
+            self.labels.remove(name)
+            return [{"name": l} for l in self.labels]
+        if path.endswith("/assignees"):
+            who = payload["assignees"]
+            if verb == "POST":
+                self.assignees += [w for w in who if w not in self.assignees]
+            else:
+                self.assignees = [a for a in self.assignees if a not in who]
+            return self.issue_json()
+        if path.endswith("/comments"):
+            return {"id": 1}
+        if verb == "PATCH":
+            self.state = payload["state"]
+            return self.issue_json()
+        return self.issue_json()  # GET
+
+
+def test_claim_sends_one_wave_of_deltas_and_no_get(monkeypatch):
+    api = FakeIssueAPI(["status:todo", "type:bug"])
+    monkeypatch.setattr(bot, "_mutation_request", api)
+    m = bot.IssueMutation(None, status="status:in_progress", add_assignees=("alice",))
+
+    updated = run(bot._apply_issue_mutation(1, issue(1, ["status:todo", "type:bug"]), m))
+
+    assert sorted(api.calls) == [("DELETE", "/labels/status%3Atodo"), ("POST", "/assignees"), ("POST", "/labels")]
+    assert set(updated.labels) == {"type:bug", "status:in_progress"}
+    assert updated.assignees == ("alice",)
+    assert set(updated.labels) == set(api.labels)
+
+
+def test_status_unknown_to_the_cache_is_removed_after_the_add(monkeypatch):
+    api = FakeIssueAPI(["status:todo", "status:blocked"])  # ミラーは status:blocked を知らない
+    monkeypatch.setattr(bot, "_mutation_request", api)
+    m = bot.IssueMutation(None, status="status:done", state="closed")
+
+    updated = run(bot._apply_issue_mutation(1, issue(1, ["status:todo"]), m))
+
+    assert ("GET", "") not in api.calls
+    assert api.calls[-1] == ("DELETE", "/labels/status%3Ablocked")
+    assert api.labels == ["status:done"]
+    assert updated.labels == ("status:done",)
+    assert updated.state == "closed"
+
+
+def test_conflict_on_cached_state_refetches_once_and_comments_after(db_path, monkeypatch):
+    api = FakeIssueAPI(["status:todo"], fail=("POST", 422))
+    monkeypatch.setattr(bot, "_mutation_request", api)
+
+    async def fetched(number):
+        return bot._mirror_issue_from_json(api.issue_json())
+
+    async def fresh():
+        return True
+
+    monkeypatch.setattr(bot, "_fetch_issue_snapshot", fetched)
+    monkeypatch.setattr(bot, "_mirror_fresh_enough", fresh)
+
+    async def scenario():
+        await bot.db_init()
+        await bot.mirror_upsert([issue(1, ["status:todo"])], {})
+        plan = lambda i: bot.IssueMutation("ok", status="status:in_progress", comment="claimed")
+        result = await bot.run_issue_mutation(1, plan)
+        return result, await bot.mirror_get(1)
+
+    retries = bot.MUTATION_STATS["conflict_retries"]
+    result, mirrored = run(scenario())
+    assert result == "ok"
+    assert bot.MUTATION_STATS["conflict_retries"] == retries + 1
+    assert api.calls[-1] == ("POST", "/comments")
+    assert api.labels == ["status:in_progress"]
+    assert mirrored.labels == ("status:in_progress",)
+
+
+def test_failed_write_posts_no_comment(db_path, monkeypatch):
+    api = FakeIssueAPI(["status:todo"], fail=("PATCH", 403))
+    monkeypatch.setattr(bot, "_mutation_request", api)
+
+    async def fetched(number):
+        return bot._mirror_issue_from_json(api.issue_json())
+
+    monkeypatch.setattr(bot, "_fetch_issue_snapshot", fetched)
+
+    async def scenario():
+        await bot.db_init()
+        plan = lambda i: bot.IssueMutation("ok", status="status:done", state="closed", comment="closed")
+        await bot.run_issue_mutation(1, plan)
+
+    with pytest.raises(bot.GithubException):
+        run(scenario())
+    assert ("POST", "/comments") not in api.calls
@@ -0,0 +1,64 @@
+import bot
+
+NOW = 1_700_000_000.0
+
+
+def headers(remaining, limit=5000, reset=NOW + 600, resource="core", **extra):
+    h = {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(reset)),
+        "X-RateLimit-Resource": resource,
+    }
+    h.update(extra)
+    return h
+
+
+def test_unobserved_budget_allows_background_work():
+    budget = bot.RateBudget(reserve=300)
+    assert budget.remaining("core", now=NOW) is None
+    assert budget.background_allowed("core", now=NOW)
+    assert budget.interval_factor("core", now=NOW) == 1
+
+
+def test_reserve_pauses_background_until_reset():
+    budget = bot.RateBudget(reserve=300)
+    budget.observe(headers(250), now=NOW)
+    assert budget.remaining("core", now=NOW) == 250
+    assert not budget.background_allowed("core", now=NOW)
+    assert budget.resume_at("core") == NOW + 600
+    # reset を過ぎたら古い残量は忘れる
+    assert budget.remaining("core", now=NOW + 601) is None
+    assert budget.background_allowed("core", now=NOW + 601)
+
+
+def test_resources_are_tracked_separately():
+    budget = bot.RateBudget(reserve=300)
+    budget.observe(headers(100, resource="graphql"), now=NOW)
+    budget.observe(headers(4000), now=NOW)
+    assert not budget.background_allowed("graphql", now=NOW)
+    assert budget.background_allowed("core", now=NOW)
+
+
+def test_interval_factor_doubles_as_budget_shrinks():
+    budget = bot.RateBudget(reserve=1000)
+    factors = []
+    for remaining in (5000, 3000, 2000, 1500, 1100):
+        budget.observe(headers(remaining), now=NOW)
+        factors.append(budget.interval_factor("core", now=NOW))
+    assert factors == [1, 1, 2, 4, 8]
+
+
+def test_retry_after_blocks_every_resource():
+    budget = bot.RateBudget(reserve=300)
+    budget.observe({"Retry-After": "60"}, status=403, now=NOW)
+    assert budget.stats["limited_responses"] == 1
+    assert not budget.background_allowed("core", now=NOW + 30)
+    assert not budget.background_allowed("graphql", now=NOW + 30)
+    assert budget.background_allowed("core", now=NOW + 61)
+
+
+def test_malformed_headers_are_ignored():
+    budget = bot.RateBudget(reserve=300)
+    budget.observe({"X-RateLimit-Remaining": "lots"}, now=NOW)
+    assert budget.remaining("core", now=NOW) is None
@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import bot
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def sign(secret, body):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def issue_payload(action, number, labels, updated_at, repo="owner/repo", state="open"):
+    return {
+        "action": action,
+        "repository": {"full_name": repo},
+        "issue": {
+            "number": number,
+            "title": f"issue {number}",
+            "state": state,
+            "labels": [{"name": l} for l in labels],
+            "assignees": [{"login": "alice"}],
+            "body": "Due: 2026-03-01",
+            "updated_at": updated_at,
+            "html_url": f"https://github.com/owner/repo/issues/{number}",
+        },
+    }
+
+
+def test_signature_accepts_only_the_matching_digest():
+    body = json.dumps({"zen": "ok"}).encode()
+    assert bot.verify_webhook_signature("s3cret", body, sign("s3cret", body))
+    assert not bot.verify_webhook_signature("s3cret", body, sign("other", body))
+    assert not bot.verify_webhook_signature("s3cret", body + b" ", sign("s3cret", body))
+    assert not bot.verify_webhook_signature("s3cret", body, None)
+    assert not bot.verify_webhook_signature("s3cret", body, "sha1=abc")
+
+
+def test_issue_events_update_the_mirror_and_mark_matching_channels(db_path):
+    async def scenario():
+        await bot.db_init()
+        await bot.upsert_bundle_group(10, "bugs", ["type:bug"])
+        await bot.upsert_bundle_group(20, "tasks", ["type:task"])
+        opened = await bot.apply_webhook_event(
+            "issues", issue_payload("opened", 7, ["Type:Bug"], "2026-01-01T00:00:00Z")
+        )
+        relabeled = await bot.apply_webhook_event(
+            "issues", issue_payload("labeled", 7, ["type:task"], "2026-01-01T00:05:00Z")
+        )
+        stale = await bot.apply_webhook_event(
+            "issues", issue_payload("edited", 7, ["type:bug"], "2026-01-01T00:01:00Z")
+        )
+        other_repo = await bot.apply_webhook_event(
+            "issues", issue_payload("opened", 8, ["type:bug"], "2026-01-01T00:00:00Z", repo="someone/else")
+        )
+        return opened, relabeled, stale, other_repo, await bot.mirror_get(7), await bot.mirror_get(8)
+
+    opened, relabeled, stale, other_repo, mirrored, missing = run(scenario())
+    assert opened == {10}
+    assert relabeled == {10, 20}  # 旧ラベルのグループも再描画する
+    assert stale == set()  # 古い配送は無視
+    assert other_repo == set()
+    assert mirrored.labels == ("type:task",)
+    assert mirrored.assignees == ("alice",)
+    assert mirrored.due.isoformat() == "2026-03-01"
+    assert missing is None
+
+
+def test_label_rename_and_delete_rewrite_mirrored_issues(db_path):
+    async def scenario():
+        await bot.db_init()
+        await bot.upsert_bundle_group(10, "bugs", ["bug"])
+        await bot.apply_webhook_event("issues", issue_payload("opened", 1, ["bug", "ui"], "2026-01-01T00:00:00Z"))
+        renamed = await bot.apply_webhook_event(
+            "label",
+            {
+                "action": "edited",
+                "repository": {"full_name": "owner/repo"},
+                "label": {"name": "type:bug"},
+                "changes": {"name": {"from": "bug"}},
+            },
+        )
+        after_rename = await bot.mirror_get(1)
+        await bot.apply_webhook_event(
+            "label", {"action": "deleted", "repository": {"full_name": "owner/repo"}, "label": {"name": "ui"}}
+        )
+        return renamed, after_rename, await bot.mirror_get(1)
+
+    renamed, after_rename, after_delete = run(scenario())
+    assert renamed == {10}
+    assert set(after_rename.labels) == {"type:bug", "ui"}
+    assert after_delete.labels == ("type:bug",)